@@ -6,10 +6,65 @@ with proper level filtering and comprehensive validation.
 """
 
 import logging
-from typing import Dict, Any, List, Set
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import takewhile
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Set
+
+from converter.description_transfer import DescriptionTransfer
+from converter.text_normalizer import TextNormalizer
 
 logger = logging.getLogger(__name__)
 
+# Source action types (lowercased) to Foundry's expected values
+_ACTION_TYPE_MAP = MappingProxyType({
+    "maneuver": "maneuver",
+    "main action": "main",
+    "main": "main",
+    "move action": "move",
+    "move": "move",
+    "triggered action": "triggered",
+    "triggered": "triggered",
+    "free action": "free",
+    "free": "free",
+    "reaction": "reaction",
+})
+
+
+@lru_cache(maxsize=64)
+def map_action_type(source_action_type: str) -> str:
+    """Map source action types to Foundry's expected lowercase values.
+
+    Shared by the ability converter and the mapper. Memoized, since characters
+    only use a handful of distinct action types.
+
+    Args:
+        source_action_type: Action type from source data (e.g., "Maneuver", "Main Action")
+
+    Returns:
+        Foundry-compatible action type (e.g., "maneuver", "main")
+    """
+    action_type = source_action_type.lower()
+    return _ACTION_TYPE_MAP.get(action_type, action_type)
+
+
+@dataclass
+class _CompendiumAbilityIndex:
+    """Compendium abilities bucketed once for constant-time name lookups.
+
+    The first item in compendium order wins on duplicate keys. For substring
+    matching every lowercased name is joined into one NUL-separated haystack;
+    offsets holds the start of each name and items the matching entries.
+    """
+    exact: Dict[str, Dict[str, Any]]
+    sanitized: Dict[str, Dict[str, Any]]
+    haystack: str
+    offsets: List[int]
+    items: List[Dict[str, Any]]
+
+
 class AbilityConverter:
     """Handles conversion of class abilities with level filtering."""
 
@@ -27,55 +82,81 @@ class AbilityConverter:
         Returns:
             List of converted ability items
         """
-        from converter.text_normalizer import TextNormalizer
-
-        converted_abilities = []
         class_data = character_data.get("class", {})
         all_abilities = class_data.get("abilities", [])
 
-        logger.info(f"Processing {len(all_abilities)} class abilities for level {character_level} character")
+        logger.info("Processing %d class abilities for level %s character",
+                    len(all_abilities), character_level)
 
         # Get selected ability IDs for compatibility with existing logic
-        selected_ability_ids = cls._get_selected_ability_ids(character_data, character_level)
+        selected_ability_ids = frozenset(
+            cls._get_selected_ability_ids(character_data, character_level)
+        )
 
+        # Index the compendium once so each ability lookup is a dict hit, not a scan
+        ability_index = cls._build_ability_index(compendium_items)
+
+        converted_abilities = []
         for ability in all_abilities:
             ability_id = ability.get("id")
-            ability_name = ability.get("name", "")
-            ability_level = ability.get("minLevel", ability.get("level", 1))
+
+            # Check if ability is selected first - it is the cheapest and most selective filter.
+            # Basic abilities are handled separately, so class abilities should be selected ones only
+            if ability_id not in selected_ability_ids:
+                logger.debug("Skipping ability %r - not selected by character", ability.get("name", ""))
+                continue
 
             # Skip abilities without required fields
+            ability_name = ability.get("name", "")
             if not ability_name:
-                logger.debug(f"Skipping ability without name: {ability_id}")
+                logger.debug("Skipping ability without name: %s", ability_id)
                 continue
 
             # Apply level filtering - only include abilities at or below character level
+            ability_level = ability.get("minLevel", ability.get("level", 1))
             if ability_level > character_level:
-                logger.debug(f"Skipping ability '{ability_name}' (level {ability_level}) - above character level {character_level}")
+                logger.debug("Skipping ability %r (level %s) - above character level %s",
+                             ability_name, ability_level, character_level)
                 continue
 
-            # Check if ability is selected - only include selected abilities for class abilities
-            # Basic abilities are handled separately, so class abilities should be selected ones only
-            is_selected = ability_id in selected_ability_ids
-
-            # Only convert and include if ability is selected (for class abilities)
-            if not is_selected:
-                logger.debug(f"Skipping ability '{ability_name}' - not selected by character")
-                continue
+            converted_ability = cls._convert_ability_safely(
+                ability, ability_index, character_level
+            )
+            if converted_ability:
+                converted_abilities.append(converted_ability)
 
-            # Convert the ability
-            try:
-                converted_ability = cls._convert_single_ability(
-                    ability, compendium_items, is_selected, character_level
-                )
-                if converted_ability:
-                    converted_abilities.append(converted_ability)
-                    logger.debug(f"Converted ability '{ability_name}' (level {ability_level}, selected: {is_selected})")
-            except Exception as e:
-                logger.error(f"Failed to convert ability '{ability_name}': {e}")
-
-        logger.info(f"Successfully converted {len(converted_abilities)} abilities (filtered from {len(all_abilities)} total)")
+        logger.info("Successfully converted %d abilities (filtered from %d total)",
+                    len(converted_abilities), len(all_abilities))
         return converted_abilities
 
+    @classmethod
+    def _convert_ability_safely(cls, ability: Dict[str, Any],
+                                ability_index: _CompendiumAbilityIndex,
+                                character_level: int) -> Optional[Dict[str, Any]]:
+        """Convert a selected ability, logging instead of raising on failure.
+
+        Args:
+            ability: Ability data dictionary
+            ability_index: Compendium index from _build_ability_index
+            character_level: Character level for context
+
+        Returns:
+            Converted ability item or None if conversion fails
+        """
+        ability_name = ability.get("name", "")
+        try:
+            converted_ability = cls._convert_single_ability(
+                ability, ability_index, True, character_level
+            )
+        except Exception as e:
+            logger.error("Failed to convert ability %r: %s", ability_name, e)
+            return None
+
+        if converted_ability:
+            logger.debug("Converted ability %r (level %s, selected: %s)", ability_name,
+                         ability.get("minLevel", ability.get("level", 1)), True)
+        return converted_ability
+
     @classmethod
     def _get_selected_ability_ids(cls, character_data: Dict[str, Any], character_level: int) -> Set[str]:
         """Get selected ability IDs from class features.
@@ -90,36 +171,69 @@ class AbilityConverter:
         selected_ability_ids = set()
         class_data = character_data.get("class", {})
 
-        for level_data in class_data.get("featuresByLevel", []):
-            level_num = level_data.get("level", 1)
-            # Only process features up to the character's level
-            if level_num <= character_level:
-                for feature in level_data.get("features", []):
-                    if (feature.get("type") == "Class Ability" and
-                        "selectedIDs" in feature.get("data", {})):
-                        selected_ability_ids.update(feature.get("data", {}).get("selectedIDs", []))
+        # Sort defensively so we can stop at the first level above the character's
+        levels = sorted(class_data.get("featuresByLevel", []),
+                        key=lambda level_data: level_data.get("level", 1))
+
+        for level_data in takewhile(lambda ld: ld.get("level", 1) <= character_level, levels):
+            for feature in level_data.get("features", ()):
+                if feature.get("type") != "Class Ability":
+                    continue
+                data = feature.get("data")
+                if data and "selectedIDs" in data:
+                    selected_ability_ids.update(data["selectedIDs"])
 
         return selected_ability_ids
 
+    @classmethod
+    def _build_ability_index(cls, compendium_items: Dict[str, Any]) -> _CompendiumAbilityIndex:
+        """Index compendium abilities in a single pass.
+
+        Args:
+            compendium_items: Loaded compendium items
+
+        Returns:
+            Ability index for _find_compendium_ability
+        """
+        exact = {}
+        sanitized = {}
+        names = []
+        offsets = []
+        items = []
+        position = 0
+
+        for item_key, item in compendium_items.items():
+            if item.get("type") != "ability":
+                continue
+            name_lower = item.get("name", "").lower()
+            exact.setdefault(name_lower, item)
+            sanitized.setdefault(
+                TextNormalizer.sanitize_for_compendium_lookup(item_key), item
+            )
+            names.append(name_lower)
+            offsets.append(position)
+            items.append(item)
+            position += len(name_lower) + 1
+
+        # Normalized names never contain NUL, so a hit can't span two names
+        return _CompendiumAbilityIndex(exact, sanitized, "\0".join(names), offsets, items)
+
     @classmethod
     def _convert_single_ability(cls, ability: Dict[str, Any],
-                               compendium_items: Dict[str, Any],
+                               ability_index: _CompendiumAbilityIndex,
                                is_selected: bool = False,
                                character_level: int = 1) -> Dict[str, Any]:
         """Convert a single ability to Foundry VTT format.
 
         Args:
             ability: Ability data dictionary
-            compendium_items: Loaded compendium items
+            ability_index: Compendium index from _build_ability_index
             is_selected: Whether ability is selected by character
             character_level: Character level for context
 
         Returns:
             Converted ability item or None if conversion fails
         """
-        from converter.text_normalizer import TextNormalizer
-        from converter.description_transfer import DescriptionTransfer
-
         ability_id = ability.get("id")
         ability_name = ability.get("name", "")
         ability_description = ability.get("description", "")
@@ -131,30 +245,25 @@ class AbilityConverter:
 
         # Try to find matching compendium item
         compendium_item = cls._find_compendium_ability(
-            normalized_name, ability_level, compendium_items
+            normalized_name, ability_level, ability_index
         )
 
         if compendium_item:
-            # Use compendium item as base
-            result_item = compendium_item.copy()
-            result_item["type"] = "ability"
-
-            # Override with source data if needed
-            if "system" not in result_item:
-                result_item["system"] = {}
-
-            result_item["system"].update({
+            # Use compendium item as base, overriding with source data. The system
+            # dict is rebuilt rather than updated so the shared compendium entry
+            # is never mutated.
+            system = {
+                **compendium_item.get("system", {}),
                 "_dsid": ability_id,
                 "_source_level": ability_level,
                 "_is_selected": is_selected
-            })
+            }
+            result_item = {**compendium_item, "type": "ability", "system": system}
 
             # Ensure action type from source data takes precedence
             source_action_type = ability.get("type", {}).get("usage", "main")
             if source_action_type:
-                # Map source action types to Foundry's expected lowercase values
-                mapped_action_type = cls._map_action_type(source_action_type)
-                result_item["system"]["type"] = mapped_action_type
+                result_item["system"]["type"] = map_action_type(source_action_type)
 
             # Use enhanced description transfer
             enhanced_description = DescriptionTransfer.enhance_description_for_foundry(
@@ -228,68 +337,32 @@ class AbilityConverter:
     @classmethod
     def _find_compendium_ability(cls, ability_name: str,
                                 ability_level: int,
-                                compendium_items: Dict[str, Any]) -> Dict[str, Any]:
+                                ability_index: _CompendiumAbilityIndex) -> Dict[str, Any]:
         """Find ability in compendium with various matching strategies.
 
         Args:
             ability_name: Normalized ability name
             ability_level: Ability level for context
-            compendium_items: Loaded compendium items
+            ability_index: Compendium index from _build_ability_index
 
         Returns:
             Matching compendium item or None
         """
-        from converter.text_normalizer import TextNormalizer
+        name_lower = ability_name.lower()
 
         # Try exact name match first
-        for item in compendium_items.values():
-            if (item.get("type") == "ability" and
-                item.get("name", "").lower() == ability_name.lower()):
-                return item
+        item = ability_index.exact.get(name_lower)
+        if item is not None:
+            return item
 
-        # Try partial name match
-        for item in compendium_items.values():
-            if (item.get("type") == "ability" and
-                ability_name.lower() in item.get("name", "").lower()):
-                return item
+        # Try partial name match with a single scan over all names
+        position = ability_index.haystack.find(name_lower)
+        if position >= 0 and ability_index.items:
+            return ability_index.items[bisect_right(ability_index.offsets, position) - 1]
 
         # Try sanitized name match
         sanitized_name = TextNormalizer.sanitize_for_compendium_lookup(ability_name)
-        for item_name, item in compendium_items.items():
-            if (item.get("type") == "ability"):
-                item_sanitized = TextNormalizer.sanitize_for_compendium_lookup(item_name)
-                if item_sanitized == sanitized_name:
-                    return item
-
-        return None
-
-    @classmethod
-    def _map_action_type(cls, source_action_type: str) -> str:
-        """Map source action types to Foundry's expected lowercase values.
-
-        Args:
-            source_action_type: Action type from source data (e.g., "Maneuver", "Main Action")
-
-        Returns:
-            Foundry-compatible action type (e.g., "maneuver", "main")
-        """
-        # Mapping from source action types to Foundry's expected values
-        action_type_mapping = {
-            "Maneuver": "maneuver",
-            "Main Action": "main",
-            "Move Action": "move",
-            "Triggered Action": "triggered",
-            "Free Action": "free",
-            "Reaction": "reaction",
-            "main": "main",
-            "maneuver": "maneuver",
-            "move": "move",
-            "triggered": "triggered",
-            "free": "free",
-            "reaction": "reaction"
-        }
-
-        return action_type_mapping.get(source_action_type, source_action_type.lower())
+        return ability_index.sanitized.get(sanitized_name)
 
     @classmethod
     def validate_ability_conversion(cls, original_abilities: List[Dict[str, Any]],
@@ -308,9 +381,13 @@ class AbilityConverter:
         original_count = len(original_abilities)
         converted_count = len(converted_abilities)
 
-        # Count abilities that should be included based on level
-        expected_count = sum(1 for ability in original_abilities
-                           if ability.get("level", 1) <= character_level)
+        # Count and name the abilities that should be included based on level
+        expected_count = 0
+        original_names = set()
+        for ability in original_abilities:
+            if ability.get("level", 1) <= character_level:
+                expected_count += 1
+                original_names.add(ability.get("name", ""))
 
         validation_result = {
             "original_count": original_count,
@@ -323,8 +400,6 @@ class AbilityConverter:
         }
 
         # Check for missing abilities
-        original_names = {ability.get("name", "") for ability in original_abilities
-                         if ability.get("level", 1) <= character_level}
         converted_names = {ability.get("name", "") for ability in converted_abilities}
 
         missing = original_names - converted_names
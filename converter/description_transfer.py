@@ -7,10 +7,54 @@ with comprehensive validation and safe fallback handling.
 
 import logging
 import re
-from typing import Dict, Any, Optional
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple
+
+from converter.text_normalizer import TextNormalizer
 
 logger = logging.getLogger(__name__)
 
+# List of allowed HTML tags in Foundry
+_ALLOWED_TAGS = (
+    "p",
+    "strong",
+    "em",
+    "i",
+    "b",
+    "u",
+    "ul",
+    "ol",
+    "li",
+    "br",
+    "div",
+    "span",
+)
+
+# Self-closing tags never need a matching close tag
+_VOID_TAGS = frozenset({"br", "img", "hr"})
+
+# Matches any open, close or self-closing tag: (slash, name, attributes, self-close)
+_TAG_SCAN_RE = re.compile(r"<(/?)([A-Za-z][A-Za-z0-9]*)([^<>]*?)(/?)>")
+
+_BOLD_RE = re.compile(r"\*\*([^*]+)\*\*")
+_ITALIC_RE = re.compile(r"\*([^*]+)\*")
+_PARA_BREAK_RE = re.compile(r"\n\s*\n")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_MARKDOWN_RE = re.compile(r"\*\*.*?\*\*|_.*?_|`.*?`")
+_MARKDOWN_MARKERS = ("**", "_", "`")
+_HTML_NAME_RE = re.compile(r"<(\w+)")
+
+
+def _nested_get(data: Dict[str, Any], *keys: str) -> Any:
+    """Return data[k1][k2]... or "" if any level is missing, without temporaries."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return ""
+        data = data.get(key)
+        if data is None:
+            return ""
+    return data
+
 
 class DescriptionTransfer:
     """Handles description transfer with validation and formatting preservation."""
@@ -30,64 +74,66 @@ class DescriptionTransfer:
         Returns:
             Transferred description text
         """
-        from converter.text_normalizer import TextNormalizer
+        description, source_label = cls._select_raw_description(
+            source_item, compendium_item
+        )
+        if not description:
+            # Safe fallback
+            logger.warning("No description found, using safe fallback")
+            return "No description available"
+
+        # Normalize and format exactly once, whichever source won
+        logger.debug("Using %s", source_label)
+        return cls._preserve_formatting(TextNormalizer.normalize_text(description))
+
+    @classmethod
+    def _select_raw_description(
+        cls,
+        source_item: Dict[str, Any],
+        compendium_item: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, str]:
+        """Pick the raw description text to transfer, in priority order.
 
+        Args:
+            source_item: Source item with description
+            compendium_item: Optional compendium item to get description from
+
+        Returns:
+            Tuple of (raw description, label of where it came from); the
+            description is empty if no source had one
+        """
         # Try compendium description first
         if compendium_item:
-            compendium_desc = compendium_item.get("description", "").strip()
-            if not compendium_desc:
+            compendium_desc = (
+                compendium_item.get("description", "").strip()
                 # Try nested description structure
-                compendium_desc = (
-                    compendium_item.get("system", {})
-                    .get("description", {})
-                    .get("value", "")
-                    .strip()
-                )
-
-            # Try effect.before field (used in ability items)
-            if not compendium_desc:
-                compendium_desc = (
-                    compendium_item.get("system", {})
-                    .get("effect", {})
-                    .get("before", "")
-                    .strip()
-                )
-
+                or _nested_get(compendium_item, "system", "description", "value").strip()
+                # Try effect.before field (used in ability items)
+                or _nested_get(compendium_item, "system", "effect", "before").strip()
+            )
             if compendium_desc:
-                logger.debug("Using compendium description")
-                return cls._preserve_formatting(
-                    TextNormalizer.normalize_text(compendium_desc)
-                )
-            else:
-                logger.warning("Compendium item has empty description")
+                return compendium_desc, "compendium description"
+            logger.warning("Compendium item has empty description")
 
         # Fallback to source description
         source_desc = source_item.get("description", "").strip()
         if source_desc:
-            logger.debug("Using source description")
-            return cls._preserve_formatting(TextNormalizer.normalize_text(source_desc))
+            return source_desc, "source description"
 
         # Try to extract from sections (used by abilities like "Mark: Trigger")
-        sections = source_item.get("sections", [])
-        if not sections:
-            sections = (
-                source_item.get("data", {}).get("ability", {}).get("sections", [])
-            )
+        sections = source_item.get("sections") or _nested_get(
+            source_item, "data", "ability", "sections"
+        )
         if sections:
-            text_parts = []
-            for section in sections:
-                if section.get("type") == "text" and section.get("text"):
-                    text_parts.append(section["text"].strip())
+            text_parts = [
+                section["text"].strip()
+                for section in sections
+                if section.get("type") == "text" and section.get("text")
+            ]
             if text_parts:
-                combined_text = " ".join(text_parts)
-                logger.debug("Using sections text as description")
-                return cls._preserve_formatting(
-                    TextNormalizer.normalize_text(combined_text)
-                )
+                return " ".join(text_parts), "sections text as description"
 
-        # Safe fallback
-        logger.warning("No description found, using safe fallback")
-        return "No description available"
+        return "", "safe fallback"
 
     @classmethod
     def _preserve_formatting(cls, description: str) -> str:
@@ -99,61 +145,53 @@ class DescriptionTransfer:
         Returns:
             Description with preserved safe formatting
         """
-        if not description:
+        # Plain text has no tags to balance
+        if not description or "<" not in description:
             return description
 
         # Preserve basic HTML/markdown that Foundry supports
         # Remove or escape potentially problematic tags
 
-        # List of allowed HTML tags in Foundry
-        allowed_tags = [
-            "p",
-            "strong",
-            "em",
-            "i",
-            "b",
-            "u",
-            "ul",
-            "ol",
-            "li",
-            "br",
-            "div",
-            "span",
-        ]
-
-        # Simple tag validation - check for balanced tags
-        for tag in allowed_tags:
-            open_pattern = f"<{tag}"
-            close_pattern = f"</{tag}>"
-            self_closing_pattern = f"<{tag}[^>]*/>"
-
-            open_count = len(re.findall(open_pattern, description, re.IGNORECASE))
-            close_count = len(re.findall(close_pattern, description, re.IGNORECASE))
-            self_closing_count = len(
-                re.findall(self_closing_pattern, description, re.IGNORECASE)
-            )
+        # Simple tag validation - count every tag in a single pass
+        opens = Counter()
+        closes = Counter()
+        for closing, name, _, self_closing in _TAG_SCAN_RE.findall(description):
+            if self_closing:
+                continue
+            if closing:
+                closes[name.lower()] += 1
+            else:
+                opens[name.lower()] += 1
+
+        # Check for tag balance (self-closing tags don't need closing tags)
+        missing_closers = []
+        for tag in _ALLOWED_TAGS:
+            if tag in _VOID_TAGS:
+                continue
+            unclosed_count = opens[tag] - closes[tag]
+            if unclosed_count > 0:
+                logger.debug(
+                    "Auto-closed %d unclosed <%s> tags in description",
+                    unclosed_count,
+                    tag,
+                )
+                missing_closers.append(f"</{tag}>" * unclosed_count)
 
-            # Check for tag balance (self-closing tags don't need closing tags)
-            if tag not in ["br", "img", "hr"]:  # These are self-closing tags
-                expected_close = open_count - self_closing_count
-                if close_count < expected_close:
-                    unclosed_count = expected_close - close_count
-                    logger.debug(
-                        f"Auto-closed {unclosed_count} unclosed <{tag}> tags in description"
-                    )
-                    description = description.rstrip()
-                    for _ in range(unclosed_count):
-                        description += f"</{tag}>"
+        if missing_closers:
+            description = description.rstrip() + "".join(missing_closers)
 
         return description
 
     @classmethod
-    def validate_transfer(cls, original: str, transferred: str) -> bool:
+    def validate_transfer(
+        cls, original: str, transferred: str, json_ok: Optional[bool] = None
+    ) -> bool:
         """Validate that description transfer was successful.
 
         Args:
             original: Original description text
             transferred: Transferred description text
+            json_ok: Precomputed JSON round-trip result for transferred, if known
 
         Returns:
             True if transfer was successful, False otherwise
@@ -172,9 +210,9 @@ class DescriptionTransfer:
             return False
 
         # Check JSON safety
-        from converter.text_normalizer import TextNormalizer
-
-        if not TextNormalizer.validate_json_roundtrip(transferred):
+        if json_ok is None:
+            json_ok = TextNormalizer.validate_json_roundtrip(transferred)
+        if not json_ok:
             logger.warning("Description is not JSON-safe")
             return False
 
@@ -204,18 +242,22 @@ class DescriptionTransfer:
             if "<" not in enhanced:  # No HTML tags
                 enhanced = f"<p>{enhanced}</p>"
 
-        # Convert common markdown patterns to HTML for Foundry
-        # Bold text: **text** -> <strong>text</strong>
-        enhanced = re.sub(r"\*\*([^*]+)\*\*", r"<strong>\1</strong>", enhanced)
+        # Convert common markdown patterns to HTML for Foundry. Plain single-line
+        # text (the common case) has no markers and skips every substitution.
+        if "*" in enhanced:
+            # Bold text: **text** -> <strong>text</strong>
+            if "**" in enhanced:
+                enhanced = _BOLD_RE.sub(r"<strong>\1</strong>", enhanced)
 
-        # Italic text: *text* -> <em>text</em>
-        enhanced = re.sub(r"\*([^*]+)\*", r"<em>\1</em>", enhanced)
+            # Italic text: *text* -> <em>text</em>
+            enhanced = _ITALIC_RE.sub(r"<em>\1</em>", enhanced)
 
-        # Double line breaks to paragraph breaks
-        enhanced = re.sub(r"\n\s*\n", "</p><p>", enhanced)
+        if "\n" in enhanced:
+            # Double line breaks to paragraph breaks
+            enhanced = _PARA_BREAK_RE.sub("</p><p>", enhanced)
 
-        # Single line breaks to line break tags
-        enhanced = re.sub(r"\n", "<br>", enhanced)
+            # Single line breaks to line break tags
+            enhanced = enhanced.replace("\n", "<br>")
 
         # Item-specific enhancements
         if item_type.lower() == "ability":
@@ -247,17 +289,27 @@ class DescriptionTransfer:
                 "is_empty": True,
             }
 
+        # Cheap substring checks rule out most descriptions before any regex runs
+        has_html = (
+            "<" in description
+            and ">" in description
+            and bool(_HTML_TAG_RE.search(description))
+        )
+        has_markdown = any(
+            marker in description for marker in _MARKDOWN_MARKERS
+        ) and bool(_MARKDOWN_RE.search(description))
+
         stats = {
             "length": len(description),
             "word_count": len(description.split()),
-            "has_html": bool(re.search(r"<[^>]+>", description)),
-            "has_markdown": bool(re.search(r"\*\*.*?\*\*|_.*?_|`.*?`", description)),
+            "has_html": has_html,
+            "has_markdown": has_markdown,
             "is_empty": not description.strip(),
         }
 
         # Extract HTML tags
         if stats["has_html"]:
-            stats["html_tags"] = list(set(re.findall(r"<(\w+)", description)))
+            stats["html_tags"] = list(set(_HTML_NAME_RE.findall(description)))
 
         return stats
 
@@ -294,7 +346,10 @@ class DescriptionTransfer:
                 audit_results["empty_descriptions"] += 1
                 continue
 
-            if cls.validate_transfer(source_desc, converted_desc):
+            # Round-trip once and share the result with validate_transfer
+            json_ok = TextNormalizer.validate_json_roundtrip(converted_desc)
+
+            if cls.validate_transfer(source_desc, converted_desc, json_ok=json_ok):
                 audit_results["successful_transfers"] += 1
             else:
                 audit_results["failed_transfers"] += 1
@@ -315,9 +370,7 @@ class DescriptionTransfer:
                 audit_results["truncated_descriptions"] += 1
 
             # Check for encoding issues
-            from converter.text_normalizer import TextNormalizer
-
-            if not TextNormalizer.validate_json_roundtrip(converted_desc):
+            if not json_ok:
                 audit_results["encoding_issues"] += 1
 
         return audit_results
@@ -1,176 +1,483 @@
-import json
+import multiprocessing
 import os
-
-
-def _convert_feature(feature_data, item_type):
-    """Converts a forgesteel feature to a Foundry VTT item."""
-    return {
-        "name": feature_data.get("name"),
-        "type": item_type,
-        "img": "icons/svg/mystery-man.svg",
-        "system": {
-            "description": {"value": feature_data.get("description"), "director": ""}
-        },
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from converter.ability_converter import AbilityConverter, map_action_type
+from converter.description_transfer import DescriptionTransfer
+from converter.loader import _json_loads, load_forgesteel_character
+from converter.level_detector import LevelDetector
+from converter.text_normalizer import TextNormalizer
+
+# Local draw-steel checkout searched for pool items missing from the compendium
+_LOCAL_PACKS_DIR = "draw_steel_repo/src/packs"
+
+# Features whose Forgesteel name differs from their compendium key
+_KNOWN_NAME_MAPPINGS = {
+    "Clarity": "clarity-and-strain",
+    "Glowing Eyes": "glowing-eyes",
+    "Psionic Bolt": "psionic-bolt",  # Handle space naming difference
+}
+
+# Type mapping from Forgesteel to Foundry item types
+_TYPE_MAPPING = {
+    "culture": "culture",
+    "career": "career",
+    "ancestry": "ancestry",
+    "ancestryTrait": "ancestrytrait",
+    "ability": "ability",
+    "feature": "feature",
+    "perk": "perk",
+    "project": "project",
+    "subclass": "subclass",
+    "complication": "complication",
+    "treasure": "treasure",
+}
+
+# Class features whose names contain any of these are framework/container
+# entries rather than content
+_CLASS_FEATURE_SKIP_PATTERNS = (
+    "pt Ability",
+    "Signature Ability",
+    "Kit",
+    "1st-Level",
+    "4th-Level",
+    "5th-Level",
+    "7th-Level",
+    "9th-Level",
+)
+_CLASS_FEATURE_SKIP_RE = re.compile(
+    "|".join(map(re.escape, _CLASS_FEATURE_SKIP_PATTERNS))
+)
+
+# Career features whose names contain any of these are handled elsewhere
+_CAREER_FEATURE_SKIP_RE = re.compile("Skill|Language|Feature")
+
+# Feature types skipped or special-cased while walking class, subclass and
+# career features
+_SKILL_LANGUAGE_CHOICE_TYPES = frozenset({"Skill Choice", "Language Choice"})
+_PERK_PROJECT_TYPES = frozenset({"Perk", "Project"})
+_CAREER_SKIP_TYPES = frozenset({"Skill Choice", "Bonus", "Characteristic Bonus"})
+_SUBCLASS_CONTAINER_TYPES = frozenset({"Perk", "Domain Feature", "Class Ability"})
+# Modifier-only features that never become items
+_BONUS_FEATURE_TYPES = frozenset(
+    {"Bonus", "Characteristic Bonus", "Heroic Resource Gain"}
+)
+_CHOICE_BONUS_TYPES = frozenset({"Bonus", "Ability Damage", "Characteristic Bonus"})
+# Forgesteel feature types that convert to something other than a feature item
+_ITEM_TYPE_MAP = {"Ability": "ability"}
+_NESTED_FEATURE_SKIP_TYPES = frozenset(
+    {"Skill Choice", "Bonus", "Characteristic Bonus", "Proficiency", "Ability Damage"}
+)
+
+# Damage types tracked on the hero's immunities and weaknesses
+_DAMAGE_TYPES = (
+    "all",
+    "acid",
+    "cold",
+    "corruption",
+    "fire",
+    "holy",
+    "lightning",
+    "poison",
+    "psychic",
+    "sonic",
+)
+
+# Distance and target for abilities built from source data alone; copied per
+# item so no two abilities share a mutable dict
+_ABILITY_DISTANCE_DEFAULT = {
+    "type": "melee",
+    "primary": 1,
+    "secondary": None,
+    "tertiary": None,
+}
+_ABILITY_TARGET_DEFAULT = {"type": "creature", "value": 1}
+
+# Skill names whose Foundry key is spelled out rather than derived
+_SKILL_SPECIAL_MAP = {
+    "Read Person": "readPerson",
+    "Aid Attack": "aidAttack",
+    "Catch Breath": "catchBreath",
+    "Escape Grab": "escapeGrab",
+    "Melee Free Strike": "meleeFreeStrike",
+    "Ranged Free Strike": "rangedFreeStrike",
+    "Stand Up": "standUp",
+    "Handle Animals": "handleAnimals",
+}
+
+# Complete skill-to-group mapping from Draw Steel config
+_SKILL_GROUPS_MAP = {
+    "alchemy": "crafting",
+    "alertness": "intrigue",
+    "architecture": "crafting",
+    "blacksmithing": "crafting",
+    "brag": "interpersonal",
+    "carpentry": "crafting",
+    "climb": "exploration",
+    "concealObject": "intrigue",
+    "cooking": "crafting",
+    "criminalUnderworld": "lore",
+    "culture": "lore",
+    "disguise": "intrigue",
+    "drive": "exploration",
+    "eavesdrop": "intrigue",
+    "empathize": "interpersonal",
+    "endurance": "exploration",
+    "escapeArtist": "intrigue",
+    "fletching": "crafting",
+    "flirt": "interpersonal",
+    "forgery": "crafting",
+    "gamble": "interpersonal",
+    "gymnastics": "exploration",
+    "handleAnimals": "interpersonal",
+    "heal": "exploration",
+    "hide": "intrigue",
+    "history": "lore",
+    "interrogate": "interpersonal",
+    "intimidate": "interpersonal",
+    "jewelry": "crafting",
+    "jump": "exploration",
+    "lead": "interpersonal",
+    "lie": "interpersonal",
+    "lift": "exploration",
+    "magic": "lore",
+    "mechanics": "crafting",
+    "monsters": "lore",
+    "music": "interpersonal",
+    "nature": "lore",
+    "navigate": "exploration",
+    "perform": "interpersonal",
+    "persuade": "interpersonal",
+    "pickLock": "intrigue",
+    "pickPocket": "intrigue",
+    "psionics": "lore",
+    "readPerson": "interpersonal",
+    "religion": "lore",
+    "ride": "exploration",
+    "rumors": "lore",
+    "sabotage": "intrigue",
+    "search": "intrigue",
+    "sneak": "intrigue",
+    "society": "lore",
+    "strategy": "lore",
+    "swim": "exploration",
+    "tailoring": "crafting",
+    "timescape": "lore",
+    "track": "intrigue",
+}
+
+# Fields that only make sense inside the compendium pack
+_COMPENDIUM_ONLY_FIELDS = frozenset({"_id", "_key", "folder"})
+
+# Basic abilities (the Basic_Abilities folder) that all heroes have regardless
+# of level, keyed by compendium DSID
+_BASIC_ABILITY_DSIDS = frozenset(
+    {
+        "aid-attack",
+        "catch-breath",
+        "charge",
+        "defend",
+        "escape-grab",
+        "grab",
+        "heal",
+        "knockback",
+        "melee-free-strike",
+        "ranged-free-strike",
+        "stand-up",
+        "advance",
+        "disengage",
+        "ride",
     }
+)
 
 
-def _map_action_type(source_action_type: str) -> str:
-    """Map source action types to Foundry's expected lowercase values.
-
-    Args:
-        source_action_type: Action type from source data (e.g., "Maneuver", "Main Action")
+@dataclass
+class CompendiumIndex:
+    """Hash indices over the compendium, built once per conversion.
 
-    Returns:
-        Foundry-compatible action type (e.g., "maneuver", "main")
+    Each mapping keeps the first item seen for a key, in compendium order, so
+    lookups resolve to the same item a linear scan would have found.
     """
-    # Mapping from source action types to Foundry's expected values
-    action_type_mapping = {
-        "Maneuver": "maneuver",
-        "Main Action": "main",
-        "Move Action": "move",
-        "Triggered Action": "triggered",
-        "Free Action": "free",
-        "Reaction": "reaction",
-        "main": "main",
-        "maneuver": "maneuver",
-        "move": "move",
-        "triggered": "triggered",
-        "free": "free",
-        "reaction": "reaction",
-    }
 
-    return action_type_mapping.get(source_action_type, source_action_type.lower())
+    items: Dict[str, Any]
+    by_name_type: Dict[Tuple[Any, Any], Any] = field(default_factory=dict)
+    by_lower_name_type: Dict[Tuple[str, str], Any] = field(default_factory=dict)
+    by_lower_name: Dict[str, Any] = field(default_factory=dict)
+    by_lower_type: Dict[str, List[Tuple[str, Any]]] = field(default_factory=dict)
+    by_id: Dict[str, Tuple[int, Any]] = field(default_factory=dict)
+    by_source_uuid: Dict[str, Tuple[int, Any]] = field(default_factory=dict)
+    by_sanitized_name: Optional[Dict[str, Any]] = None
+    type_trigrams: Dict[str, Dict[str, Set[int]]] = field(default_factory=dict)
+    basic_abilities: List[Any] = field(default_factory=list)
+    feature_matches: Dict[Tuple[str, Optional[str]], Any] = field(
+        default_factory=dict
+    )
 
+    @classmethod
+    def build(cls, compendium_items):
+        """Index compendium items by name and type.
+
+        Args:
+            compendium_items: Loaded compendium items (dict)
+
+        Returns:
+            CompendiumIndex over the given items
+        """
+        index = cls(compendium_items)
+        for position, (dsid, item) in enumerate(compendium_items.items()):
+            name = item.get("name")
+            item_type = item.get("type")
+            if dsid in _BASIC_ABILITY_DSIDS and item_type == "ability":
+                index.basic_abilities.append(item)
+            # Interned so probes with an interned query compare by identity
+            name_lower = sys.intern((name or "").lower())
+            type_lower = sys.intern((item_type or "").lower())
+
+            index.by_name_type.setdefault((name, item_type), item)
+            index.by_lower_name_type.setdefault((name_lower, type_lower), item)
+            index.by_lower_name.setdefault(name_lower, item)
+            index.by_lower_type.setdefault(type_lower, []).append((name_lower, item))
+
+            # Positions are kept so find_by_uuid can honour compendium order
+            item_id = item.get("_id")
+            if item_id:
+                index.by_id.setdefault(item_id, (position, item))
+            source_id = item.get("flags", {}).get("draw-steel", {}).get("sourceId")
+            if source_id:
+                index.by_source_uuid.setdefault(source_id, (position, item))
+        return index
+
+    def find_by_uuid(self, uuid):
+        """Find the compendium item an advancement pool UUID refers to.
+
+        An item matches if its _id is the last UUID segment or its
+        draw-steel sourceId is the full UUID; the earliest match wins.
+
+        Args:
+            uuid: Foundry document UUID from an advancement pool
+
+        Returns:
+            Matching compendium item, or None
+        """
+        by_id = self.by_id.get(uuid.rpartition(".")[2])
+        by_source = self.by_source_uuid.get(uuid)
+        if by_id and by_source:
+            return min(by_id, by_source, key=lambda match: match[0])[1]
+        match = by_id or by_source
+        return match[1] if match else None
+
+    def find_feature(self, name, compendium_type):
+        """Find the compendium item for a Forgesteel feature name.
+
+        Results, misses included, are memoized per index, since the same
+        feature names recur across a character and across a batch.
+
+        Args:
+            name: Normalized feature name
+            compendium_type: Lowercase compendium type, or None if the
+                feature type has no compendium counterpart
+
+        Returns:
+            First item found by the lookup tiers in priority order, or None
+        """
+        key = (name, compendium_type)
+        try:
+            return self.feature_matches[key]
+        except KeyError:
+            lookups = self._feature_lookups(name, compendium_type)
+            match = next(filter(None, lookups), None)
+            self.feature_matches[key] = match
+            return match
+
+    def _feature_lookups(self, name, compendium_type):
+        """Yield the result of each feature lookup tier, most specific first.
+
+        Tiers are evaluated lazily, so later (costlier) ones only run when
+        every earlier one missed.
+        """
+        # Check if this is a known mapping
+        known_key = _KNOWN_NAME_MAPPINGS.get(name)
+        if known_key in self.items:
+            yield self.items[known_key]
+            return
+
+        name_lower = sys.intern(name.lower())
+        if compendium_type:
+            # First, try to find by name AND type (strict matching)
+            yield self.by_lower_name_type.get((name_lower, compendium_type))
+            # If not found by exact name, try finding by type and similar name
+            yield self.find_by_name_substring(name_lower, compendium_type)
 
-def _convert_feature(feature_data, item_type, compendium_items):
-    """Converts a forgesteel feature to a Foundry VTT item."""
-    from converter.text_normalizer import TextNormalizer
+        # If still not found by type, try just by name (case-insensitive, any type)
+        yield self.by_lower_name.get(name_lower)
+        # Also try with quotes (some names have quotes in compendium)
+        yield self.by_lower_name.get(f'"{name_lower}"')
 
-    original_name = feature_data.get("name")
-    name = (
-        TextNormalizer.normalize_text(original_name) if original_name else original_name
-    )
+        # Finally, try variations by removing punctuation using text normalizer,
+        # checking both the key (dsid) and the item's name
+        if name:
+            yield self.find_by_sanitized_name(
+                TextNormalizer.sanitize_for_compendium_lookup(name)
+            )
 
-    # Special case mappings for features that have different names in Forgesteel vs Compendium
-    known_mappings = {
-        "Clarity": "clarity-and-strain",
-        "Glowing Eyes": "glowing-eyes",
-        "Psionic Bolt": "psionic-bolt",  # Handle space naming difference
-    }
+    def find_by_name_substring(self, name_lower, type_lower):
+        """Find the first item of a type whose lowercase name contains a string.
+
+        Every trigram of the query must also occur in a matching name, so
+        intersecting per-trigram posting lists narrows the candidates before
+        any substring test. The posting lists for a type are built the first
+        time that type is searched.
+
+        Args:
+            name_lower: Lowercase text to look for
+            type_lower: Lowercase compendium item type
+
+        Returns:
+            Matching compendium item, or None
+        """
+        entries = self.by_lower_type.get(type_lower, ())
+        query_trigrams = _trigrams(name_lower)
+        if query_trigrams and entries:
+            postings = self.type_trigrams.get(type_lower)
+            if postings is None:
+                postings = {}
+                for position, (item_name, _) in enumerate(entries):
+                    for trigram in _trigrams(item_name):
+                        postings.setdefault(trigram, set()).add(position)
+                self.type_trigrams[type_lower] = postings
+
+            candidates = None
+            # Intersect the rarest trigrams first to shrink the set quickly
+            rarest_first = sorted(
+                query_trigrams, key=lambda trigram: len(postings.get(trigram, ()))
+            )
+            for trigram in rarest_first:
+                posting = postings.get(trigram)
+                if not posting:
+                    return None
+                if candidates is None:
+                    candidates = set(posting)
+                else:
+                    candidates &= posting
+                if not candidates:
+                    return None
+            positions = sorted(candidates)
+        else:
+            positions = range(len(entries))
+
+        for position in positions:
+            item_name, item = entries[position]
+            if name_lower in item_name:
+                return item
+        return None
+
+    def find_by_sanitized_name(self, sanitized_name):
+        """Find the first item whose key (dsid) or name sanitizes to the given name.
+
+        The sanitized index is only needed when every other lookup missed, so
+        it is built on first use rather than in build().
+
+        Args:
+            sanitized_name: Name already passed through
+                TextNormalizer.sanitize_for_compendium_lookup
+
+        Returns:
+            Matching compendium item, or None
+        """
+        if self.by_sanitized_name is None:
+            sanitize = TextNormalizer.sanitize_for_compendium_lookup
+            by_sanitized_name = {}
+            for item_key, item in self.items.items():
+                by_sanitized_name.setdefault(sanitize(item_key), item)
+                by_sanitized_name.setdefault(sanitize(item.get("name", "")), item)
+            self.by_sanitized_name = by_sanitized_name
+        return self.by_sanitized_name.get(sanitized_name)
+
+
+def _trigrams(text):
+    """Return the set of three-character substrings of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class _ItemKeys:
+    """Tracks the (name, type) pairs of an actor's items for duplicate checks.
+
+    The item list is only ever appended to, so each check first absorbs any
+    items added since the previous one; every item is hashed exactly once.
+    """
 
-    compendium_item = None
+    def __init__(self, items):
+        self._items = items
+        self._keys = set()
+        self._synced = 0
 
-    # Check if this is a known mapping
-    if name in known_mappings and known_mappings[name] in compendium_items:
-        compendium_item = compendium_items[known_mappings[name]]
-    else:
-        # Type mapping from Forgesteel to Foundry item types
-        type_mapping = {
-            "culture": "culture",
-            "career": "career",
-            "ancestry": "ancestry",
-            "ancestryTrait": "ancestrytrait",
-            "ability": "ability",
-            "feature": "feature",
-            "perk": "perk",
-            "project": "project",
-            "subclass": "subclass",
-            "complication": "complication",
-            "treasure": "treasure",
-        }
+    def has(self, item):
+        """Return True if an item with the same name and type is present."""
+        items = self._items
+        for existing in items[self._synced :]:
+            self._keys.add((existing.get("name"), existing.get("type")))
+        self._synced = len(items)
+        return (item.get("name"), item.get("type")) in self._keys
 
-        compendium_type = type_mapping.get(item_type)
 
-        # First, try to find by name AND type (strict matching)
-        if compendium_type:
-            compendium_item = next(
-                (
-                    item
-                    for item in compendium_items.values()
-                    if item.get("name", "").lower() == name.lower()
-                    and item.get("type", "").lower() == compendium_type.lower()
-                ),
-                None,
-            )
+def _strip_compendium_fields(compendium_item, **overrides):
+    """Copy a compendium item without its compendium-specific fields.
 
-        # If not found by exact name, try finding by type and similar name
-        if not compendium_item and compendium_type:
-            compendium_item = next(
-                (
-                    item
-                    for item in compendium_items.values()
-                    if name.lower() in item.get("name", "").lower()
-                    and item.get("type", "").lower() == compendium_type.lower()
-                ),
-                None,
-            )
+    Args:
+        compendium_item: Item from the compendium (left unmodified)
+        **overrides: Top-level fields to replace on the copy
 
-        # If still not found by type, try just by name (case-insensitive, any type)
-        if not compendium_item:
-            compendium_item = next(
-                (
-                    item
-                    for item in compendium_items.values()
-                    if item.get("name", "").lower() == name.lower()
-                ),
-                None,
-            )
+    Returns:
+        Shallow copy without _id, _key and folder
+    """
+    item_copy = {
+        key: value
+        for key, value in compendium_item.items()
+        if key not in _COMPENDIUM_ONLY_FIELDS
+    }
+    item_copy.update(overrides)
+    return item_copy
 
-        # Also try with quotes (some names have quotes in compendium)
-        if not compendium_item:
-            quoted_name = f'"{name}"'
-            compendium_item = next(
-                (
-                    item
-                    for item in compendium_items.values()
-                    if item.get("name", "").lower() == quoted_name.lower()
-                ),
-                None,
-            )
 
-    # If not found by type+name, try variations by removing punctuation using text normalizer
-    if not compendium_item and name:
-        sanitized_name = TextNormalizer.sanitize_for_compendium_lookup(name)
-        for item_key, item in compendium_items.items():
-            # Check both the key (dsid) and the item's name
-            key_sanitized = TextNormalizer.sanitize_for_compendium_lookup(item_key)
-            item_name_sanitized = TextNormalizer.sanitize_for_compendium_lookup(
-                item.get("name", "")
-            )
-            if key_sanitized == sanitized_name or item_name_sanitized == sanitized_name:
-                compendium_item = item
-                break
+def _convert_feature(feature_data, item_type, compendium_index):
+    """Converts a forgesteel feature to a Foundry VTT item."""
+    original_name = feature_data.get("name")
+    name = (
+        TextNormalizer.normalize_text(original_name) if original_name else original_name
+    )
 
-    if compendium_item:
-        item_copy = compendium_item.copy()
+    compendium_item = compendium_index.find_feature(name, _TYPE_MAPPING.get(item_type))
 
-        # Remove compendium-specific fields that shouldn't be in imported items
-        item_copy.pop("_key", None)
-        item_copy.pop("folder", None)
-        # Remove _id so writer generates a fresh one
-        item_copy.pop("_id", None)
+    if compendium_item:
+        # Drop compendium-specific fields; without _id the writer generates
+        # a fresh one
+        item_copy = _strip_compendium_fields(compendium_item)
 
         # Apply description transfer to ensure proper Foundry format
-        from converter.description_transfer import DescriptionTransfer
-
         description = DescriptionTransfer.transfer_description(feature_data, item_copy)
 
-        # Ensure the description field exists and is properly formatted
-        if "system" not in item_copy:
-            item_copy["system"] = {}
-        item_copy["system"]["description"] = {"value": description, "director": ""}
+        # Give the copy its own system dict so the shared compendium entry is
+        # never mutated, then set the properly formatted description on it
+        item_copy["system"] = {
+            **item_copy.get("system", {}),
+            "description": {"value": description, "director": ""},
+        }
 
         # Don't override system.type - use the compendium's value which is correct
         # The compendium has the proper Foundry format (e.g., "freeTriggered" not "triggered")
 
         return item_copy
 
-    # Use enhanced description transfer
-    from converter.description_transfer import DescriptionTransfer
-
-    description = DescriptionTransfer.transfer_description(
-        feature_data, compendium_item
-    )
+    # No compendium match, so the description comes from the source alone
+    description = DescriptionTransfer.transfer_description(feature_data)
 
     result_item = {
         "name": name,
@@ -207,14 +514,9 @@ def _convert_feature(feature_data, item_type, compendium_items):
         result_item["system"].update(
             {
                 "keywords": ability_data.get("keywords", []),
-                "type": _map_action_type(source_action_type),
-                "distance": {
-                    "type": "melee",
-                    "primary": 1,
-                    "secondary": None,
-                    "tertiary": None,
-                },
-                "target": {"type": "creature", "value": 1},
+                "type": map_action_type(source_action_type),
+                "distance": dict(_ABILITY_DISTANCE_DEFAULT),
+                "target": dict(_ABILITY_TARGET_DEFAULT),
                 "effect": {"before": ability_data.get("description", ""), "after": ""},
                 "power": {
                     "roll": {
@@ -229,20 +531,74 @@ def _convert_feature(feature_data, item_type, compendium_items):
     return result_item
 
 
+def _extract_ability(feature):
+    """Return a feature's nested data.ability, or the feature itself if absent."""
+    return feature.get("data", {}).get("ability", feature)
+
+
+def _ability_feature(feature):
+    """Rebuild a nested Ability feature in the shape _convert_feature expects."""
+    ability_data = _extract_ability(feature)
+    return {
+        "name": ability_data.get("name"),
+        "description": ability_data.get("description"),
+        "data": {"ability": ability_data},
+    }
+
+
+def _iter_ancestry_features(ancestry):
+    """Yield the effective ancestry features, expanding Choice selections."""
+    for feature in ancestry.get("features", []):
+        if feature.get("type") == "Choice":
+            yield from feature.get("data", {}).get("selected", [])
+        else:
+            yield feature
+
+
+def _scan_ancestry_features(ancestry):
+    """Collect the stability bonus and speed from ancestry features in one pass.
+
+    Args:
+        ancestry: Forgesteel ancestry data (may be None)
+
+    Returns:
+        Tuple of (stability bonus, speed); speed is None if no Speed feature
+        sets one
+    """
+    stability_bonus = 0
+    speed = None
+    if not ancestry:
+        return stability_bonus, speed
+
+    for feature in _iter_ancestry_features(ancestry):
+        if feature.get("name") == "Grounded":
+            stability_bonus += 1
+        if feature.get("type") == "Speed":
+            feature_speed = feature.get("data", {}).get("speed")
+            if feature_speed:
+                speed = feature_speed
+    return stability_bonus, speed
+
+
 def convert_character(character_data, compendium_items, strict=False, verbose=False):
     """Converts forgesteel character data to Foundry VTT format.
 
     Args:
         character_data: Forgesteel character data (dict)
-        compendium_items: Loaded compendium items (dict)
+        compendium_items: Loaded compendium items (dict), or a CompendiumIndex
+            already built over them
         strict: If True, fail on missing compendium items; if False, create placeholders
         verbose: If True, enable debug logging
 
     Returns:
         Foundry VTT character data (dict) or None on failure
     """
-    from converter.level_detector import LevelDetector
-    from converter.text_normalizer import TextNormalizer
+    # Index the compendium once so lookups below are hash probes, not scans
+    if isinstance(compendium_items, CompendiumIndex):
+        compendium_index = compendium_items
+        compendium_items = compendium_index.items
+    else:
+        compendium_index = CompendiumIndex.build(compendium_items)
 
     # Detect character level using multi-source detection
     character_level = LevelDetector.detect_level(character_data)
@@ -257,32 +613,26 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
     class_data = character_data.get("class", {})
     base_recoveries = class_data.get("recoveries", 8)
 
-    # Calculate stability from ancestry traits (e.g., Grounded adds +1)
-    base_stability = 0
-    ancestry = character_data.get("ancestry", {})
-    if ancestry:
-        for feature in ancestry.get("features", []):
-            if feature.get("type") == "Choice":
-                for selected_feature in feature.get("data", {}).get("selected", []):
-                    if selected_feature.get("name") == "Grounded":
-                        base_stability += 1
-            elif feature.get("name") == "Grounded":
-                base_stability += 1
+    # Calculate stability from ancestry traits (e.g., Grounded adds +1) and
+    # pick up the ancestry Speed for the movement calculation below
+    base_stability, ancestry_speed = _scan_ancestry_features(
+        character_data.get("ancestry")
+    )
 
     # NOTE: Stamina is always 20 for level 1 heroes in Foundry
     # Kit bonuses are applied separately during prepareBaseData
     # Don't override the base stamina value
 
     # Basic Information
+    state = character_data.get("state", {})
     foundry_character = {
         "name": character_data.get("name"),
         "type": "hero",
         "img": "icons/svg/mystery-man.svg",
         "system": {
             "stamina": {
-                "value": base_stamina
-                - character_data.get("state", {}).get("staminaDamage", 0),
-                "temporary": character_data.get("state", {}).get("staminaTemp", 0),
+                "value": base_stamina - state.get("staminaDamage", 0),
+                "temporary": state.get("staminaTemp", 0),
             },
             "characteristics": {
                 "might": {"value": 0},
@@ -306,74 +656,44 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
             },
             "movement": {"value": 6, "types": ["walk"], "hover": False, "disengage": 1},
             "damage": {
-                "immunities": {
-                    "all": 0,
-                    "acid": 0,
-                    "cold": 0,
-                    "corruption": 0,
-                    "fire": 0,
-                    "holy": 0,
-                    "lightning": 0,
-                    "poison": 0,
-                    "psychic": 0,
-                    "sonic": 0,
-                },
-                "weaknesses": {
-                    "all": 0,
-                    "acid": 0,
-                    "cold": 0,
-                    "corruption": 0,
-                    "fire": 0,
-                    "holy": 0,
-                    "lightning": 0,
-                    "poison": 0,
-                    "psychic": 0,
-                    "sonic": 0,
-                },
+                "immunities": dict.fromkeys(_DAMAGE_TYPES, 0),
+                "weaknesses": dict.fromkeys(_DAMAGE_TYPES, 0),
             },
             "recoveries": {"value": base_recoveries, "max": 0},
             "hero": {
                 "primary": {"value": 0},
                 "epic": {"value": 0},
-                "surges": character_data.get("state", {}).get("surges", 0),
-                "xp": character_data.get("state", {}).get("xp", 0),
-                "victories": character_data.get("state", {}).get("victories", 0),
-                "renown": character_data.get("state", {}).get("renown", 0),
-                "wealth": character_data.get("state", {}).get("wealth", 0),
+                "surges": state.get("surges", 0),
+                "xp": state.get("xp", 0),
+                "victories": state.get("victories", 0),
+                "renown": state.get("renown", 0),
+                "wealth": state.get("wealth", 0),
                 "skills": [],
                 "preferredKit": None,
             },
         },
         "items": [],
     }
+    items_out = foundry_character["items"]
+    item_keys = _ItemKeys(items_out)
 
     # Movement calculation: extract from ancestry Speed features
     movement_speed = 5  # Default base movement for all heroes
-    kit_speed_bonus = 0
-    ancestry_speed = None
-
-    # Process Ancestry Features for Speed
-    ancestry = character_data.get("ancestry")
-    if ancestry:
-        for feature in ancestry.get("features", []):
-            if feature.get("type") == "Choice":
-                for selected_feature in feature.get("data", {}).get("selected", []):
-                    if selected_feature.get("type") == "Speed":
-                        ancestry_speed = selected_feature.get("data", {}).get("speed")
-                        if ancestry_speed:
-                            movement_speed = ancestry_speed
-            elif feature.get("type") == "Speed":
-                ancestry_speed = feature.get("data", {}).get("speed")
-                if ancestry_speed:
-                    movement_speed = ancestry_speed
-
-    # Process Class Kits for Speed bonus
-    for level_data in class_data.get("featuresByLevel", []):
-        for feature in level_data.get("features", []):
-            if feature.get("type") == "Kit" and "selected" in feature.get("data", {}):
-                for kit in feature.get("data", {}).get("selected", []):
-                    kit_speed = kit.get("speed", 0)
-                    kit_speed_bonus = max(kit_speed_bonus, kit_speed)
+    if ancestry_speed:
+        movement_speed = ancestry_speed
+
+    # Process Class Kits for Speed bonus (the best kit counts, never below 0)
+    kit_speed_bonus = max(
+        (
+            kit.get("speed", 0)
+            for level_data in class_data.get("featuresByLevel", [])
+            for feature in level_data.get("features") or ()
+            if feature.get("type") == "Kit"
+            for kit in feature.get("data", {}).get("selected") or ()
+        ),
+        default=0,
+    )
+    kit_speed_bonus = max(kit_speed_bonus, 0)
 
     movement_speed += kit_speed_bonus
 
@@ -402,8 +722,9 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
 
         # Primary characteristics start at 2
         for char in primary_chars:
-            if char.lower() in char_values:
-                char_values[char.lower()] = 2
+            char_name = char.lower()
+            if char_name in char_values:
+                char_values[char_name] = 2
 
         # Apply characteristic bonuses from features
         if class_data.get("featuresByLevel"):
@@ -415,14 +736,11 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
                 level_num = level_data.get("level", 1)
                 # Only apply features up to the character's level
                 if level_num <= character_level:
-                    for feature in level_data.get("features", []):
+                    for feature in level_data.get("features") or ():
                         if feature.get("type") == "Characteristic Bonus":
-                            char_name = (
-                                feature.get("data", {})
-                                .get("characteristic", "")
-                                .lower()
-                            )
-                            value = feature.get("data", {}).get("value", 0)
+                            bonus_data = feature.get("data", {})
+                            char_name = bonus_data.get("characteristic", "").lower()
+                            value = bonus_data.get("value", 0)
                             if char_name in char_values:
                                 char_values[char_name] += value
 
@@ -431,12 +749,20 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
         if char_name in foundry_character["system"]["characteristics"]:
             foundry_character["system"]["characteristics"][char_name]["value"] = value
 
+    # Class feature levels up to the character's level, selected once for the
+    # class feature and ability/kit passes below
+    class_levels = [
+        level_data
+        for level_data in class_data.get("featuresByLevel", [])
+        if level_data.get("level", 1) <= character_level
+    ]
+
     # Ancestry
     ancestry = character_data.get("ancestry")
     if ancestry:
-        item = _convert_feature(ancestry, "ancestry", compendium_items)
+        item = _convert_feature(ancestry, "ancestry", compendium_index)
         if item:
-            foundry_character["items"].append(item)
+            items_out.append(item)
 
         # Process ancestry advancements to add granted items (traits/abilities)
         # Only process if the ancestry doesn't have features that are already handled separately
@@ -451,539 +777,362 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
                     # Add items from the ancestry's advancement pool
                     for pool_item in advancement["pool"]:
                         if "uuid" in pool_item:
-                            uuid_target = pool_item["uuid"].split(".")[-1]
                             # Look up the item in compendium by UUID
                             added_item = None
-                            for comp_item in compendium_items.values():
-                                if (
-                                    comp_item.get("_id") == uuid_target
-                                    or comp_item.get("flags", {})
-                                    .get("draw-steel", {})
-                                    .get("sourceId")
-                                    == pool_item["uuid"]
-                                ):
-                                    item_copy = comp_item.copy()
-                                    # Remove compendium-specific fields
-                                    item_copy.pop("_id", None)
-                                    item_copy.pop("_key", None)
-                                    item_copy.pop("folder", None)
-                                    foundry_character["items"].append(item_copy)
-                                    added_item = item_copy
-                                    break
+                            comp_item = compendium_index.find_by_uuid(pool_item["uuid"])
+                            if comp_item:
+                                item_copy = _strip_compendium_fields(comp_item)
+                                items_out.append(item_copy)
+                                added_item = item_copy
 
                             # If we added an item, process its advancements too
                             if added_item:
                                 _process_item_advancements(
-                                    added_item, compendium_items, foundry_character
+                                    added_item, compendium_index, foundry_character
                                 )
 
-        for feature in ancestry.get("features", []):
+        for feature in ancestry.get("features") or ():
             if feature.get("type") == "Choice":
-                for selected_feature in feature.get("data", {}).get("selected", []):
+                for selected_feature in feature.get("data", {}).get("selected") or ():
                     # Ancestry features should always be ancestryTrait, even if they contain abilities
                     # The abilities will be granted through the trait's advancements
                     selected_type = selected_feature.get("type", "ancestryTrait")
-                    item_type = "ancestryTrait"
+                    selected_data = selected_feature.get("data", {})
 
                     # Try to find the item in compendium first (to get advancements)
-                    item_name = selected_feature.get("name")
-                    item = None
-                    for comp_item in compendium_items.values():
-                        if (
-                            comp_item.get("name") == item_name
-                            and comp_item.get("type") == item_type
-                        ):
-                            item = comp_item.copy()
-                            # Remove compendium-specific fields
-                            item.pop("_id", None)
-                            item.pop("_key", None)
-                            item.pop("folder", None)
-                            break
-
-                    # If not found in compendium, create from feature data
-                    if not item:
-                        item = _convert_feature(
-                            selected_feature, item_type, compendium_items
-                        )
-
+                    item = _resolve_ancestry_trait(
+                        selected_feature, compendium_index, strip_compendium_fields=True
+                    )
                     if item:
                         # Check for duplicates before adding
-                        is_duplicate = any(
-                            existing.get("name") == item.get("name")
-                            and existing.get("type") == item.get("type")
-                            for existing in foundry_character["items"]
-                        )
-                        if not is_duplicate:
-                            foundry_character["items"].append(item)
+                        if not item_keys.has(item):
+                            items_out.append(item)
 
                         # Process selected feature advancements to add granted abilities
-                        if "system" in item and "advancements" in item["system"]:
-                            for advancement_id, advancement in item["system"][
-                                "advancements"
-                            ].items():
-                                if (
-                                    advancement.get("type") == "itemGrant"
-                                    and "pool" in advancement
-                                ):
-                                    # Add abilities from the feature's advancement pool
-                                    for pool_item in advancement["pool"]:
-                                        if "uuid" in pool_item:
-                                            # Look up the ability in compendium by UUID
-                                            for comp_item in compendium_items.values():
-                                                if (
-                                                    comp_item.get("_id")
-                                                    == pool_item["uuid"].split(".")[-1]
-                                                    or comp_item.get("flags", {})
-                                                    .get("draw-steel", {})
-                                                    .get("sourceId")
-                                                    == pool_item["uuid"]
-                                                ):
-                                                    ability_copy = comp_item.copy()
-                                                    ability_copy["type"] = "ability"
-                                                    # Remove compendium-specific fields
-                                                    ability_copy.pop("_id", None)
-                                                    ability_copy.pop("_key", None)
-                                                    ability_copy.pop("folder", None)
-                                                    foundry_character["items"].append(
-                                                        ability_copy
-                                                    )
-                                                    break
+                        _grant_pool_abilities(item, compendium_index, foundry_character)
 
                     # Handle nested Choice features (e.g., Psionic Gift -> Psionic Bolt)
                     if (
                         selected_type == "Choice"
                         and "data" in selected_feature
-                        and "selected" in selected_feature.get("data", {})
+                        and "selected" in selected_data
                     ):
                         # For nested Choice features, we need to:
                         # 1. Add the parent feature as a trait from compendium (to get advancements)
                         # 2. Process its advancement to grant the selected ability
-                        parent_name = selected_feature.get("name")
-
-                        # Look up the parent trait in compendium
-                        parent_trait = None
-                        for comp_item in compendium_items.values():
-                            if (
-                                comp_item.get("name") == parent_name
-                                and comp_item.get("type") == "ancestryTrait"
-                            ):
-                                parent_trait = comp_item.copy()
-                                break
-
+                        parent_trait = _resolve_ancestry_trait(
+                            selected_feature, compendium_index, convert_missing=False
+                        )
                         if parent_trait:
                             # Check for duplicates before adding the trait
-                            is_duplicate = any(
-                                existing.get("name") == parent_trait.get("name")
-                                and existing.get("type") == parent_trait.get("type")
-                                for existing in foundry_character["items"]
-                            )
-                            if not is_duplicate:
-                                foundry_character["items"].append(parent_trait)
+                            if not item_keys.has(parent_trait):
+                                items_out.append(parent_trait)
 
                                 # Process the trait's advancement to grant selected abilities
                                 _process_choice_advancement(
                                     parent_trait,
-                                    selected_feature.get("data", {}).get(
-                                        "selected", []
-                                    ),
-                                    compendium_items,
+                                    selected_data["selected"],
+                                    compendium_index,
                                     foundry_character,
                                 )
             else:
                 # For non-Choice features, try to use compendium version to get advancements
-                feature_name = feature.get("name")
-                item = None
-                for comp_item in compendium_items.values():
-                    if (
-                        comp_item.get("name") == feature_name
-                        and comp_item.get("type") == "ancestryTrait"
-                    ):
-                        item = comp_item.copy()
-                        break
-
-                # If not found in compendium, create from feature data
-                if not item:
-                    item = _convert_feature(feature, "ancestryTrait", compendium_items)
-
+                item = _resolve_ancestry_trait(feature, compendium_index)
                 if item:
                     # Check for duplicates before adding
-                    is_duplicate = any(
-                        existing.get("name") == item.get("name")
-                        and existing.get("type") == item.get("type")
-                        for existing in foundry_character["items"]
-                    )
-                    if not is_duplicate:
-                        foundry_character["items"].append(item)
+                    if not item_keys.has(item):
+                        items_out.append(item)
 
                         # Process ancestry trait advancements to add granted abilities
                         _process_item_advancements(
-                            item, compendium_items, foundry_character
+                            item, compendium_index, foundry_character
                         )
 
     # Culture
     culture = character_data.get("culture")
     if culture:
-        item = _convert_feature(culture, "culture", compendium_items)
+        item = _convert_feature(culture, "culture", compendium_index)
         if item:
-            foundry_character["items"].append(item)
+            items_out.append(item)
 
     # Class
+    # Selected kits from class features, collected while walking them below
+    class_kits = []
     hero_class = character_data.get("class")
     if hero_class:
-        item = _convert_feature(hero_class, "class", compendium_items)
+        item = _convert_feature(hero_class, "class", compendium_index)
         if item:
             # Add the level to the class item system
             if "system" not in item:
                 item["system"] = {}
             item["system"]["level"] = hero_class.get("level", 1)
         if item:
-            foundry_character["items"].append(item)
-        # Process class features with level filtering
-        for level_data in hero_class.get("featuresByLevel", []):
-            level_num = level_data.get("level", 1)
-            # Only process features up to the character's level
-            if level_num <= character_level:
-                for feature in level_data.get("features", []):
-                    # Skip placeholder features that have no actual content selected
-                    feature_type = feature.get("type", "")
-                    feature_data = feature.get("data", {})
-
-                    # Always skip Skill Choice and Language Choice features - they're handled separately
-                    if feature_type in ["Skill Choice", "Language Choice"]:
-                        continue
+            items_out.append(item)
+        # Process class features up to the character's level
+        for level_data in class_levels:
+            for feature in level_data.get("features") or ():
+                # Skip placeholder features that have no actual content selected
+                feature_type = feature.get("type", "")
+                feature_data = feature.get("data", {})
 
-                    # Skip Class Ability features - they're meta containers, the actual abilities are handled separately
-                    if feature_type == "Class Ability":
-                        continue
-
-                    # Handle Domain Feature by extracting selected abilities
-                    if feature_type == "Domain Feature":
-                        selected_items = feature_data.get("selected", [])
-                        for selected_item in selected_items:
-                            # Check if selected item is a Multiple Features container
-                            if selected_item.get("type") == "Multiple Features":
-                                nested_features = selected_item.get("data", {}).get(
-                                    "features", []
-                                )
-                                for nested_feature in nested_features:
-                                    nested_type = nested_feature.get("type")
-                                    if nested_type in [
-                                        "Skill Choice",
-                                        "Bonus",
-                                        "Characteristic Bonus",
-                                        "Proficiency",
-                                        "Ability Damage",
-                                    ]:
-                                        continue
-                                    if nested_type == "Ability":
-                                        ability_data = nested_feature.get(
-                                            "data", {}
-                                        ).get("ability", nested_feature)
-                                        reconstructed = {
-                                            "name": ability_data.get("name"),
-                                            "description": ability_data.get(
-                                                "description"
-                                            ),
-                                            "data": {"ability": ability_data},
-                                        }
-                                        item = _convert_feature(
-                                            reconstructed, "ability", compendium_items
-                                        )
-                                    elif nested_type == "Text":
-                                        item = _convert_feature(
-                                            nested_feature, "feature", compendium_items
-                                        )
-                                    else:
-                                        continue
-                                    if item:
-                                        foundry_character["items"].append(item)
-                            else:
-                                item = _convert_feature(
-                                    selected_item, "ability", compendium_items
-                                )
-                                if item:
-                                    foundry_character["items"].append(item)
-                        continue
-
-                    # Skip other framework/container features that don't represent actual content
-                    feature_name = feature.get("name", "")
-                    skip_patterns = [
-                        "pt Ability",
-                        "Signature Ability",
-                        "Kit",
-                        "1st-Level",
-                        "4th-Level",
-                        "5th-Level",
-                        "7th-Level",
-                        "9th-Level",
-                    ]
-                    if any(pattern in feature_name for pattern in skip_patterns):
-                        continue
-
-                    # Handle Perk and Project features by extracting their selected items
-                    if feature_type in ["Perk", "Project"]:
-                        selected_items = feature_data.get("selected", [])
-                        for selected_item in selected_items:
-                            item = _convert_feature(
-                                selected_item, feature_type.lower(), compendium_items
-                            )
-                            if item:
-                                foundry_character["items"].append(item)
-                        continue
-
-                    if feature.get("type") == "Choice":
-                        for selected_feature in feature.get("data", {}).get(
-                            "selected", []
-                        ):
-                            selected_type = selected_feature.get("type", "")
-                            # Skip bonus-type features that are just modifiers
-                            if selected_type in [
-                                "Bonus",
-                                "Ability Damage",
-                                "Characteristic Bonus",
-                            ]:
-                                continue
-                            item_type = (
-                                "ability" if selected_type == "Ability" else "feature"
+                # Collect selected kits (from features with type "Kit" that have selected kits)
+                if feature_type == "Kit" and "selected" in feature_data:
+                    class_kits.extend(feature_data["selected"])
+
+                # Always skip Skill Choice and Language Choice features - they're handled separately
+                if feature_type in _SKILL_LANGUAGE_CHOICE_TYPES:
+                    continue
+
+                # Skip Class Ability features - they're meta containers, the actual abilities are handled separately
+                if feature_type == "Class Ability":
+                    continue
+
+                # Handle Domain Feature by extracting selected abilities
+                if feature_type == "Domain Feature":
+                    selected_items = feature_data.get("selected") or ()
+                    for selected_item in selected_items:
+                        # Check if selected item is a Multiple Features container
+                        if selected_item.get("type") == "Multiple Features":
+                            nested_features = selected_item.get("data", {}).get(
+                                "features", []
                             )
-
+                            for nested_feature in nested_features:
+                                nested_type = nested_feature.get("type")
+                                if nested_type in _NESTED_FEATURE_SKIP_TYPES:
+                                    continue
+                                if nested_type == "Ability":
+                                    item = _convert_feature(
+                                        _ability_feature(nested_feature),
+                                        "ability",
+                                        compendium_index,
+                                    )
+                                elif nested_type == "Text":
+                                    item = _convert_feature(
+                                        nested_feature, "feature", compendium_index
+                                    )
+                                else:
+                                    continue
+                                if item:
+                                    items_out.append(item)
+                        else:
                             item = _convert_feature(
-                                selected_feature, item_type, compendium_items
+                                selected_item, "ability", compendium_index
                             )
                             if item:
-                                foundry_character["items"].append(item)
-                        continue
-                    elif feature_type == "Multiple Features":
-                        # Process Multiple Features to extract nested items
-                        nested_features = feature_data.get("features", [])
-                        for nested_feature in nested_features:
-                            nested_type = nested_feature.get("type")
-
-                            # Skip placeholder/framework types
-                            if nested_type in [
-                                "Skill Choice",
-                                "Bonus",
-                                "Characteristic Bonus",
-                                "Proficiency",
-                                "Ability Damage",
-                            ]:
-                                continue
-
-                            if nested_type == "Ability":
-                                # Extract the actual ability data from nested structure
-                                ability_data = nested_feature.get("data", {}).get(
-                                    "ability", nested_feature
-                                )
-                                reconstructed_feature = {
-                                    "name": ability_data.get("name"),
-                                    "description": ability_data.get("description"),
-                                    "data": {"ability": ability_data},
-                                }
-                                item = _convert_feature(
-                                    reconstructed_feature, "ability", compendium_items
-                                )
-                                if item:
-                                    foundry_character["items"].append(item)
-                            elif nested_type == "Text":
-                                # Text features should be converted as features
-                                item = _convert_feature(
-                                    nested_feature, "feature", compendium_items
-                                )
-                                if item:
-                                    foundry_character["items"].append(item)
-                        continue
-                    elif feature_type not in [
-                        "Bonus",
-                        "Characteristic Bonus",
-                        "Heroic Resource Gain",
-                    ]:
-                        # Process non-placeholder feature types (including Heroic Resource, Text, Ability, etc.)
-                        # Use the feature's actual type for conversion
-                        item_type = (
-                            "ability" if feature_type == "Ability" else "feature"
+                                items_out.append(item)
+                    continue
+
+                # Skip other framework/container features that don't represent actual content
+                feature_name = feature.get("name", "")
+                if _CLASS_FEATURE_SKIP_RE.search(feature_name):
+                    continue
+
+                # Handle Perk and Project features by extracting their selected items
+                if feature_type in _PERK_PROJECT_TYPES:
+                    selected_items = feature_data.get("selected") or ()
+                    for selected_item in selected_items:
+                        item = _convert_feature(
+                            selected_item, feature_type.lower(), compendium_index
                         )
+                        if item:
+                            items_out.append(item)
+                    continue
 
-                        # For Ability type, extract the nested ability data
-                        if (
-                            feature_type == "Ability"
-                            and "data" in feature
-                            and "ability" in feature["data"]
-                        ):
-                            feature_to_convert = feature["data"]["ability"]
-                        else:
-                            feature_to_convert = feature
+                if feature.get("type") == "Choice":
+                    for selected_feature in feature.get("data", {}).get(
+                        "selected", []
+                    ):
+                        selected_type = selected_feature.get("type", "")
+                        # Skip bonus-type features that are just modifiers
+                        if selected_type in _CHOICE_BONUS_TYPES:
+                            continue
+                        item_type = _ITEM_TYPE_MAP.get(selected_type, "feature")
 
                         item = _convert_feature(
-                            feature_to_convert, item_type, compendium_items
+                            selected_feature, item_type, compendium_index
                         )
                         if item:
-                            foundry_character["items"].append(item)
+                            items_out.append(item)
+                    continue
+                elif feature_type == "Multiple Features":
+                    # Process Multiple Features to extract nested items
+                    nested_features = feature_data.get("features") or ()
+                    for nested_feature in nested_features:
+                        nested_type = nested_feature.get("type")
+
+                        # Skip placeholder/framework types
+                        if nested_type in _NESTED_FEATURE_SKIP_TYPES:
+                            continue
+
+                        if nested_type == "Ability":
+                            # Extract the actual ability data from nested structure
+                            item = _convert_feature(
+                                _ability_feature(nested_feature),
+                                "ability",
+                                compendium_index,
+                            )
+                            if item:
+                                items_out.append(item)
+                        elif nested_type == "Text":
+                            # Text features should be converted as features
+                            item = _convert_feature(
+                                nested_feature, "feature", compendium_index
+                            )
+                            if item:
+                                items_out.append(item)
+                    continue
+                elif feature_type not in _BONUS_FEATURE_TYPES:
+                    # Process non-placeholder feature types (including Heroic Resource, Text, Ability, etc.)
+                    # Use the feature's actual type for conversion
+                    item_type = _ITEM_TYPE_MAP.get(feature_type, "feature")
+
+                    # For Ability type, extract the nested ability data
+                    feature_to_convert = feature
+                    if item_type == "ability":
+                        feature_to_convert = _extract_ability(feature)
+
+                    item = _convert_feature(
+                        feature_to_convert, item_type, compendium_index
+                    )
+                    if item:
+                        items_out.append(item)
 
     # Career
     career = character_data.get("career")
     if career:
-        item = _convert_feature(career, "career", compendium_items)
+        item = _convert_feature(career, "career", compendium_index)
         if item:
-            foundry_character["items"].append(item)
-        for feature in career.get("features", []):
+            items_out.append(item)
+        for feature in career.get("features") or ():
             feature_name = feature.get("name", "")
             feature_type = feature.get("type", "")
 
             # Skip framework/placeholder features
-            if feature_type in ["Skill Choice", "Bonus", "Characteristic Bonus"]:
+            if feature_type in _CAREER_SKIP_TYPES:
                 continue
 
             # Handle Perk and Project features by extracting their selected items
-            if feature_type in ["Perk", "Project"]:
-                selected_items = feature.get("data", {}).get("selected", [])
+            if feature_type in _PERK_PROJECT_TYPES:
+                selected_items = feature.get("data", {}).get("selected") or ()
                 for selected_item in selected_items:
                     item = _convert_feature(
-                        selected_item, feature_type.lower(), compendium_items
+                        selected_item, feature_type.lower(), compendium_index
                     )
                     if item:
-                        foundry_character["items"].append(item)
+                        items_out.append(item)
                 continue
 
-            skip_patterns = ["Skill", "Language", "Feature"]
-            if any(pattern in feature_name for pattern in skip_patterns):
+            if _CAREER_FEATURE_SKIP_RE.search(feature_name):
                 continue
 
-            processed_feature = _convert_feature(feature, "feature", compendium_items)
+            processed_feature = _convert_feature(feature, "feature", compendium_index)
             if processed_feature:
-                foundry_character["items"].append(processed_feature)
+                items_out.append(processed_feature)
 
     # Collect selected kits that will be processed later
     selected_kits = []
 
-    # Subclass items (only include selected subclass)
-    subclasses = class_data.get("subclasses", [])
-    for subclass in subclasses:
-        if subclass.get("selected", False):
-            item = _convert_feature(subclass, "subclass", compendium_items)
-            if item:
-                foundry_character["items"].append(item)
-
-    # Subclass features (including skills) - only for selected subclass
-    subclasses = class_data.get("subclasses", [])
-    for subclass in subclasses:
-        if not subclass.get("selected", False):
-            continue
-        for level_data in subclass.get("featuresByLevel", []):
-            level_num = level_data.get("level", 1)
-            if level_num <= character_level:
-                for feature in level_data.get("features", []):
-                    feature_type = feature.get("type", "")
-
-                    # Skip Skill Choice - will be processed by _process_skills_from_advancements
-                    if feature_type == "Skill Choice":
-                        continue
+    # Only the selected subclass contributes items; normally there is one, but
+    # every selected entry is honoured
+    selected_subclasses = [
+        subclass
+        for subclass in class_data.get("subclasses", ())
+        if subclass.get("selected", False)
+    ]
+
+    # Subclass items
+    for subclass in selected_subclasses:
+        item = _convert_feature(subclass, "subclass", compendium_index)
+        if item:
+            items_out.append(item)
+
+    # Subclass features (including skills), up to the character's level
+    subclass_levels = [
+        level_data
+        for subclass in selected_subclasses
+        for level_data in subclass.get("featuresByLevel", [])
+        if level_data.get("level", 1) <= character_level
+    ]
+    for level_data in subclass_levels:
+        for feature in level_data.get("features") or ():
+            feature_type = feature.get("type", "")
 
-                    # Process Kit features to get kit abilities
-                    if feature_type == "Kit":
-                        # Process the selected kits and their abilities
-                        selected_kits.extend(feature_data.get("selected", []))
-                        continue
+            # Skip Skill Choice - will be processed by _process_skills_from_advancements
+            if feature_type == "Skill Choice":
+                continue
 
-                    # Process Multiple Features to extract nested items
-                    if feature_type == "Multiple Features":
-                        nested_features = feature_data.get("features", [])
-                        for nested_feature in nested_features:
-                            nested_type = nested_feature.get("type")
-
-                            # Skip placeholder/framework types
-                            if nested_type in [
-                                "Skill Choice",
-                                "Bonus",
-                                "Characteristic Bonus",
-                                "Proficiency",
-                                "Ability Damage",
-                            ]:
-                                continue
-
-                            if nested_type == "Ability":
-                                ability_data = nested_feature.get("data", {}).get(
-                                    "ability", nested_feature
-                                )
-                                reconstructed_feature = {
-                                    "name": ability_data.get("name"),
-                                    "description": ability_data.get("description"),
-                                    "data": {"ability": ability_data},
-                                }
-                                item = _convert_feature(
-                                    reconstructed_feature, "ability", compendium_items
-                                )
-                                if item:
-                                    foundry_character["items"].append(item)
-                            elif nested_type == "Text":
-                                item = _convert_feature(
-                                    nested_feature, "feature", compendium_items
-                                )
-                                if item:
-                                    foundry_character["items"].append(item)
-                        continue
+            # Process Kit features to get kit abilities
+            if feature_type == "Kit":
+                # Process the selected kits and their abilities
+                selected_kits.extend(feature_data.get("selected") or ())
+                continue
 
-                    # Skip other placeholder/container features
-                    if feature_type in ["Perk", "Domain Feature", "Class Ability"]:
-                        continue
+            # Process Multiple Features to extract nested items
+            if feature_type == "Multiple Features":
+                nested_features = feature_data.get("features") or ()
+                for nested_feature in nested_features:
+                    nested_type = nested_feature.get("type")
 
-                    # Handle Choice type features by extracting selected items
-                    if feature_type == "Choice":
-                        for selected_feature in feature.get("data", {}).get(
-                            "selected", []
-                        ):
-                            selected_type = selected_feature.get("type", "")
-                            # Skip bonus-type features that are just modifiers
-                            if selected_type in [
-                                "Bonus",
-                                "Ability Damage",
-                                "Characteristic Bonus",
-                            ]:
-                                continue
-                            item_type = (
-                                "ability" if selected_type == "Ability" else "feature"
-                            )
-                            item = _convert_feature(
-                                selected_feature, item_type, compendium_items
-                            )
-                            if item:
-                                foundry_character["items"].append(item)
+                    # Skip placeholder/framework types
+                    if nested_type in _NESTED_FEATURE_SKIP_TYPES:
                         continue
 
-                    # Process other features normally (Heroic Resource should be processed as feature, Heroic Resource Gain should be skipped)
-                    if feature_type not in [
-                        "Bonus",
-                        "Characteristic Bonus",
-                        "Heroic Resource Gain",
-                    ]:
-                        # Use the feature's actual type for conversion
-                        item_type = (
-                            "ability" if feature_type == "Ability" else "feature"
+                    if nested_type == "Ability":
+                        item = _convert_feature(
+                            _ability_feature(nested_feature),
+                            "ability",
+                            compendium_index,
                         )
-
-                        # For Ability type, extract the nested ability data
-                        if (
-                            feature_type == "Ability"
-                            and "data" in feature
-                            and "ability" in feature["data"]
-                        ):
-                            feature_to_convert = feature["data"]["ability"]
-                        else:
-                            feature_to_convert = feature
-
+                        if item:
+                            items_out.append(item)
+                    elif nested_type == "Text":
                         item = _convert_feature(
-                            feature_to_convert, item_type, compendium_items
+                            nested_feature, "feature", compendium_index
                         )
                         if item:
-                            foundry_character["items"].append(item)
+                            items_out.append(item)
+                continue
+
+            # Skip other placeholder/container features
+            if feature_type in _SUBCLASS_CONTAINER_TYPES:
+                continue
+
+            # Handle Choice type features by extracting selected items
+            if feature_type == "Choice":
+                for selected_feature in feature.get("data", {}).get("selected") or ():
+                    selected_type = selected_feature.get("type", "")
+                    # Skip bonus-type features that are just modifiers
+                    if selected_type in _CHOICE_BONUS_TYPES:
+                        continue
+                    item_type = _ITEM_TYPE_MAP.get(selected_type, "feature")
+                    item = _convert_feature(
+                        selected_feature, item_type, compendium_index
+                    )
+                    if item:
+                        items_out.append(item)
+                continue
+
+            # Process other features normally (Heroic Resource should be processed as feature, Heroic Resource Gain should be skipped)
+            if feature_type not in _BONUS_FEATURE_TYPES:
+                # Use the feature's actual type for conversion
+                item_type = _ITEM_TYPE_MAP.get(feature_type, "feature")
+
+                # For Ability type, extract the nested ability data
+                feature_to_convert = feature
+                if item_type == "ability":
+                    feature_to_convert = _extract_ability(feature)
+
+                item = _convert_feature(feature_to_convert, item_type, compendium_index)
+                if item:
+                    items_out.append(item)
 
     # Skills from characteristics section
     if "characteristics" in class_data:
-        skills_list = []
-        for char in class_data["characteristics"]:
-            if "skills" in char:
-                skills_list.extend(
-                    [_normalize_skill_name(s) for s in char.get("skills", [])]
-                )
+        skills_list = [
+            _normalize_skill_name(s)
+            for char in class_data["characteristics"]
+            for s in char.get("skills") or ()
+        ]
         if skills_list:
             # Add skills to hero section
             foundry_character["system"]["hero"]["skills"] = skills_list
@@ -991,112 +1140,42 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
     # Complication
     complication = character_data.get("complication")
     if complication and complication != "null":
-        item = _convert_feature(complication, "complication", compendium_items)
+        item = _convert_feature(complication, "complication", compendium_index)
         if item:
-            foundry_character["items"].append(item)
+            items_out.append(item)
 
     # Top-level features
-    for feature in character_data.get("features", []):
+    for feature in character_data.get("features") or ():
         feature_type = feature.get("type", "")
         # Skip placeholder/framework features
-        if feature_type in ["Language Choice", "Skill Choice"]:
+        if feature_type in _SKILL_LANGUAGE_CHOICE_TYPES:
             continue
-        item = _convert_feature(feature, "feature", compendium_items)
+        item = _convert_feature(feature, "feature", compendium_index)
         if item:
-            foundry_character["items"].append(item)
-
-    # Collect selected ability IDs from all level features
-    selected_ability_ids = set()
-
-    for level_data in class_data.get("featuresByLevel", []):
-        level_num = level_data.get("level", 1)
-        # Only process features up to the character's level
-        if level_num <= character_level:
-            for feature in level_data.get("features", []):
-                # Collect selected ability IDs
-                if feature.get(
-                    "type"
-                ) == "Class Ability" and "selectedIDs" in feature.get("data", {}):
-                    selected_ability_ids.update(
-                        feature.get("data", {}).get("selectedIDs", [])
-                    )
-                # Collect selected kits (from features with type "Kit" that have selected kits)
-                elif feature.get("type") == "Kit" and "selected" in feature.get(
-                    "data", {}
-                ):
-                    selected_kits.extend(feature.get("data", {}).get("selected", []))
+            items_out.append(item)
+
+    # Class kits were gathered during the class feature pass; they follow any
+    # subclass kits
+    selected_kits.extend(class_kits)
 
     # Kits - process selected kits from class features
     for kit in selected_kits:
-        kit_item = _convert_feature(kit, "kit", compendium_items)
+        kit_item = _convert_feature(kit, "kit", compendium_index)
         if kit_item:
-            foundry_character["items"].append(kit_item)
+            items_out.append(kit_item)
 
             # Process kit advancements to add kit-specific abilities
-            if "system" in kit_item and "advancements" in kit_item["system"]:
-                for advancement_id, advancement in kit_item["system"][
-                    "advancements"
-                ].items():
-                    if advancement.get("type") == "itemGrant" and "pool" in advancement:
-                        # Add abilities from the kit's advancement pool
-                        for pool_item in advancement["pool"]:
-                            if "uuid" in pool_item:
-                                # Look up the ability in compendium by UUID
-                                for comp_item in compendium_items.values():
-                                    if (
-                                        comp_item.get("_id")
-                                        == pool_item["uuid"].split(".")[-1]
-                                        or comp_item.get("flags", {})
-                                        .get("draw-steel", {})
-                                        .get("sourceId")
-                                        == pool_item["uuid"]
-                                    ):
-                                        ability_copy = comp_item.copy()
-                                        ability_copy["type"] = "ability"
-                                        # Remove compendium-specific fields
-                                        ability_copy.pop("_id", None)
-                                        ability_copy.pop("_key", None)
-                                        ability_copy.pop("folder", None)
-                                        foundry_character["items"].append(ability_copy)
-                                        break
+            _grant_pool_abilities(kit_item, compendium_index, foundry_character)
 
     # Abilities - include basic abilities plus level-appropriate class abilities
-    from converter.ability_converter import AbilityConverter
-
-    # Add basic abilities that all heroes have regardless of level
-    # These are fundamental abilities from the Basic_Abilities folder
-    basic_dsids = {
-        "aid-attack",
-        "catch-breath",
-        "charge",
-        "defend",
-        "escape-grab",
-        "grab",
-        "heal",
-        "knockback",
-        "melee-free-strike",
-        "ranged-free-strike",
-        "stand-up",
-        "advance",
-        "disengage",
-        "ride",
-    }
-
     # Always include basic abilities - these are fundamental to all characters
-    for dsid, compendium_item in compendium_items.items():
-        if dsid in basic_dsids and compendium_item.get("type") == "ability":
-            ability_copy = compendium_item.copy()
-            # Remove compendium-specific fields
-            ability_copy.pop("_id", None)
-            ability_copy.pop("_key", None)
-            ability_copy.pop("folder", None)
-            foundry_character["items"].append(ability_copy)
+    items_out.extend(map(_strip_compendium_fields, compendium_index.basic_abilities))
 
     # Then convert and add class abilities with level filtering
     class_abilities = AbilityConverter.convert_class_abilities(
         character_data, character_level, compendium_items
     )
-    foundry_character["items"].extend(class_abilities)
+    items_out.extend(class_abilities)
 
     # Log ability conversion summary
     if class_abilities:
@@ -1109,9 +1188,7 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
 
     # Inventory
     for item in character_data.get("state", {}).get("inventory", []):
-        foundry_character["items"].append(
-            _convert_feature(item, "treasure", compendium_items)
-        )
+        items_out.append(_convert_feature(item, "treasure", compendium_index))
 
     # Post-processing: Extract skills from item advancements
     _populate_advancement_selections(
@@ -1124,25 +1201,20 @@ def convert_character(character_data, compendium_items, strict=False, verbose=Fa
     return foundry_character
 
 
+@lru_cache(maxsize=1024)
 def _normalize_skill_name(skill_name):
-    """Convert skill name from Forgesteel format (Title Case) to Foundry format (camelCase)."""
+    """Convert skill name from Forgesteel format (Title Case) to Foundry format (camelCase).
+
+    Memoized, since characters draw from a small, fixed set of skill names.
+    Language names go through here too, so they share the cache.
+    """
     if not skill_name:
         return skill_name
 
     # Special cases
-    special_map = {
-        "Read Person": "readPerson",
-        "Aid Attack": "aidAttack",
-        "Catch Breath": "catchBreath",
-        "Escape Grab": "escapeGrab",
-        "Melee Free Strike": "meleeFreeStrike",
-        "Ranged Free Strike": "rangedFreeStrike",
-        "Stand Up": "standUp",
-        "Handle Animals": "handleAnimals",
-    }
-
-    if skill_name in special_map:
-        return special_map[skill_name]
+    special = _SKILL_SPECIAL_MAP.get(skill_name)
+    if special is not None:
+        return special
 
     # General case: convert to camelCase
     # Split by spaces and capitalize each word except the first
@@ -1151,119 +1223,249 @@ def _normalize_skill_name(skill_name):
         return skill_name
 
     # First word is lowercase, rest are capitalized
-    first_word = words[0].lower()
-    other_words = [word.capitalize() for word in words[1:]]
+    return words[0].lower() + "".join(word.capitalize() for word in words[1:])
 
-    return first_word + "".join(other_words)
 
+def _resolve_ancestry_trait(
+    feature, compendium_index, strip_compendium_fields=False, convert_missing=True
+):
+    """Resolve an ancestry feature to an ancestryTrait item.
 
-def _process_item_advancements(item, compendium_items, foundry_character):
-    """Process advancements for an item to add granted abilities."""
+    The compendium version is preferred because it carries the trait's
+    advancements.
+
+    Args:
+        feature: Forgesteel ancestry feature
+        compendium_index: CompendiumIndex to look the trait up in
+        strip_compendium_fields: If True, drop _id, _key and folder from the copy
+        convert_missing: If True, build the trait from the feature data when the
+            compendium has no exact match
+
+    Returns:
+        The trait item, or None if it was not found and not converted
+    """
+    item = None
+    comp_item = compendium_index.by_name_type.get(
+        (feature.get("name"), "ancestryTrait")
+    )
+    if comp_item:
+        if strip_compendium_fields:
+            item = _strip_compendium_fields(comp_item)
+        else:
+            item = comp_item.copy()
+
+    # If not found in compendium, create from feature data
+    if not item and convert_missing:
+        item = _convert_feature(feature, "ancestryTrait", compendium_index)
+    return item
+
+
+def _grant_pool_abilities(
+    item, compendium_index, foundry_character, search_local_packs=False
+):
+    """Add the abilities in an item's itemGrant advancement pools to the actor.
+
+    Args:
+        item: Item whose advancements may grant abilities
+        compendium_index: CompendiumIndex to resolve pool UUIDs in
+        foundry_character: Actor being built
+        search_local_packs: If True, pool entries missing from the compendium
+            are looked for in the local packs checkout; otherwise they are
+            skipped
+    """
     if "system" not in item or "advancements" not in item["system"]:
         return
 
     for advancement_id, advancement in item["system"]["advancements"].items():
         if advancement.get("type") == "itemGrant" and "pool" in advancement:
-            # Add abilities from the item's advancement pool
             for pool_item in advancement["pool"]:
                 if "uuid" in pool_item:
-                    uuid_target = pool_item["uuid"].split(".")[-1]
                     # Look up the ability in compendium by UUID
-                    for comp_item in compendium_items.values():
-                        if (
-                            comp_item.get("_id") == uuid_target
-                            or comp_item.get("flags", {})
-                            .get("draw-steel", {})
-                            .get("sourceId")
-                            == pool_item["uuid"]
-                        ):
-                            ability_copy = comp_item.copy()
-                            ability_copy["type"] = "ability"
-                            # Remove compendium-specific fields
-                            ability_copy.pop("_id", None)
-                            ability_copy.pop("_key", None)
-                            ability_copy.pop("folder", None)
-                            foundry_character["items"].append(ability_copy)
-                            break
-                    else:
-                        # If not found by _id, search all compendium items for matching _id
-                        # This handles cases where items have same _dsid but different _id
-                        for root, dirs, files in os.walk("draw_steel_repo/src/packs"):
-                            for file in files:
-                                if file.endswith(".json") and uuid_target in file:
-                                    file_path = os.path.join(root, file)
-                                    try:
-                                        with open(
-                                            file_path, "r", encoding="utf-8"
-                                        ) as f:
-                                            direct_item = json.load(f)
-                                            if direct_item.get("_id") == uuid_target:
-                                                ability_copy = direct_item.copy()
-                                                ability_copy["type"] = "ability"
-                                                # Remove compendium-specific fields
-                                                ability_copy.pop("_id", None)
-                                                ability_copy.pop("_key", None)
-                                                ability_copy.pop("folder", None)
-                                                foundry_character["items"].append(
-                                                    ability_copy
-                                                )
-                                                break
-                                    except:
-                                        pass
-                            if any(
-                                item.get("_id") == uuid_target
-                                for item in foundry_character["items"][-1:]
-                            ):
-                                break
+                    comp_item = compendium_index.find_by_uuid(pool_item["uuid"])
+                    if comp_item:
+                        ability_copy = _strip_compendium_fields(
+                            comp_item, type="ability"
+                        )
+                        foundry_character["items"].append(ability_copy)
+                    elif search_local_packs:
+                        _grant_from_local_packs(
+                            pool_item["uuid"].rpartition(".")[2], foundry_character
+                        )
+
+
+@lru_cache(maxsize=1)
+def _local_pack_json_files():
+    """List the JSON files of the local packs checkout, grouped by directory.
+
+    Walked once per process; the fallback below would otherwise re-walk the
+    whole tree for every pool UUID missing from the compendium.
+
+    Returns:
+        Tuple of (directory, tuple of JSON file names) pairs in walk order
+    """
+    return tuple(
+        (root, tuple(file for file in files if file.endswith(".json")))
+        for root, dirs, files in os.walk(_LOCAL_PACKS_DIR)
+    )
+
+
+@lru_cache(maxsize=None)
+def _read_local_pack_item(file_path):
+    """Parse a local pack JSON file, at most once per process.
+
+    Callers must copy the result before changing it, since it is shared.
+    """
+    with open(file_path, "rb") as f:
+        return _json_loads(f.read())
+
+
+def _process_item_advancements(item, compendium_index, foundry_character):
+    """Process advancements for an item to add granted abilities."""
+    _grant_pool_abilities(
+        item, compendium_index, foundry_character, search_local_packs=True
+    )
+
+
+def _grant_from_local_packs(uuid_target, foundry_character):
+    """Add a pool ability missing from the compendium from the local packs checkout.
+
+    This handles cases where items have same _dsid but different _id.
+    """
+    for root, files in _local_pack_json_files():
+        for file in files:
+            if uuid_target in file:
+                try:
+                    direct_item = _read_local_pack_item(os.path.join(root, file))
+                    # Valid JSON that is not a document (e.g. a list) is skipped
+                    if (
+                        isinstance(direct_item, dict)
+                        and direct_item.get("_id") == uuid_target
+                    ):
+                        ability_copy = _strip_compendium_fields(
+                            direct_item, type="ability"
+                        )
+                        foundry_character["items"].append(ability_copy)
+                        break
+                except (OSError, ValueError):
+                    # Unreadable or malformed pack files are skipped; orjson's
+                    # decode errors subclass ValueError like json's do
+                    pass
+        if any(
+            item.get("_id") == uuid_target for item in foundry_character["items"][-1:]
+        ):
+            break
 
 
 def _process_choice_advancement(
-    trait_item, selected_items, compendium_items, foundry_character
+    trait_item, selected_items, compendium_index, foundry_character
 ):
     """Process a trait's choice advancement to grant only selected items."""
     if "system" not in trait_item or "advancements" not in trait_item["system"]:
         return
 
     # Get the names of selected items
-    selected_names = [item.get("name", "") for item in selected_items]
+    selected_names = frozenset(item.get("name", "") for item in selected_items)
 
-    for advancement_id, advancement in trait_item["system"]["advancements"].items():
+    for advancement in trait_item["system"]["advancements"].values():
         if advancement.get("type") == "itemGrant" and "pool" in advancement:
             # Only add items that were selected
             for pool_item in advancement["pool"]:
                 if "uuid" in pool_item:
-                    uuid_target = pool_item["uuid"].split(".")[-1]
+                    uuid_target = pool_item["uuid"].rpartition(".")[2]
 
                     # Look up the item to get its name
-                    pool_item_name = None
-                    for comp_item in compendium_items.values():
-                        if comp_item.get("_id") == uuid_target:
-                            pool_item_name = comp_item.get("name", "")
-                            break
+                    id_match = compendium_index.by_id.get(uuid_target)
+                    pool_item_name = id_match[1].get("name", "") if id_match else None
 
                     # Skip if this item wasn't selected
                     if pool_item_name not in selected_names:
                         continue
 
                     # Add the selected item
-                    for comp_item in compendium_items.values():
-                        if (
-                            comp_item.get("_id") == uuid_target
-                            or comp_item.get("flags", {})
-                            .get("draw-steel", {})
-                            .get("sourceId")
-                            == pool_item["uuid"]
-                        ):
-                            item_copy = comp_item.copy()
-                            item_copy["type"] = (
-                                "ability"  # Ensure it's marked as ability
+                    comp_item = compendium_index.find_by_uuid(pool_item["uuid"])
+                    if comp_item:
+                        item_copy = _strip_compendium_fields(comp_item, type="ability")
+                        foundry_character["items"].append(item_copy)
+
+
+def _iter_skill_choice_names(features_list):
+    """Yield the normalized skills selected by the Skill Choice features in a list."""
+    for feature in features_list or ():
+        if feature.get("type") == "Skill Choice":
+            # Normalize skill names to camelCase format used by Foundry
+            skills = feature.get("data", {}).get("selected", [])
+            yield from map(_normalize_skill_name, skills or ())
+
+
+def _iter_selected_skill_names(features_list, include_domains=False):
+    """Yield the normalized skills selected by Forgesteel Skill Choice features.
+
+    Skill Choices nested one level inside Multiple Features are included.
+
+    Args:
+        features_list: Forgesteel features, in source order
+        include_domains: If True, also walk selected Domains' featuresByLevel,
+            where only Skill Choices inside Multiple Features count
+    """
+    for feature in features_list or ():
+        feature_type = feature.get("type")
+        if feature_type == "Skill Choice":
+            yield from _iter_skill_choice_names((feature,))
+        elif feature_type == "Multiple Features":
+            yield from _iter_skill_choice_names(
+                feature.get("data", {}).get("features", [])
+            )
+        elif include_domains and feature_type == "Domain":
+            for domain in feature.get("data", {}).get("selected", []):
+                for domain_level_data in domain.get("featuresByLevel", []):
+                    for domain_feature in domain_level_data.get("features", []):
+                        if domain_feature.get("type") == "Multiple Features":
+                            yield from _iter_skill_choice_names(
+                                domain_feature.get("data", {}).get("features", [])
                             )
-                            # Remove compendium-specific fields
-                            item_copy.pop("_id", None)
-                            item_copy.pop("_key", None)
-                            item_copy.pop("folder", None)
-                            foundry_character["items"].append(item_copy)
-                            break
+
+
+def _iter_selected_language_names(features_list):
+    """Yield the normalized languages selected by Language Choice features."""
+    for feature in features_list or ():
+        if feature.get("type") == "Language Choice":
+            languages = feature.get("data", {}).get("selected", [])
+            yield from map(_normalize_skill_name, languages or ())
+
+
+def _iter_culture_languages(source_data):
+    """Yield the normalized languages selected in the culture's sections."""
+    culture = source_data.get("culture", {})
+    if culture:
+        for section_name in ["language", "environment", "organization", "upbringing"]:
+            if section_name in culture:
+                section = culture[section_name]
+                if section.get("type") == "Language Choice":
+                    languages = section.get("data", {}).get("selected", [])
+                    yield from map(_normalize_skill_name, languages or ())
+
+
+def _iter_career_languages(source_data):
+    """Yield the normalized languages selected by the career's features."""
+    career = source_data.get("career", {})
+    if career:
+        yield from _iter_selected_language_names(career.get("features", []))
+
+
+def _iter_class_languages(source_data):
+    """Yield the normalized languages selected by the class's features."""
+    class_data = source_data.get("class", {})
+    if class_data:
+        for level_data in class_data.get("featuresByLevel", []):
+            yield from _iter_selected_language_names(level_data.get("features", []))
+
+
+# Language advancements only draw on the Forgesteel source matching the item type
+_LANGUAGE_SOURCES = {
+    "culture": _iter_culture_languages,
+    "career": _iter_career_languages,
+    "class": _iter_class_languages,
+}
 
 
 def _populate_advancement_selections(character_data, source_data, compendium_items):
@@ -1273,27 +1475,6 @@ def _populate_advancement_selections(character_data, source_data, compendium_ite
     # Collect all skill selections from Forgesteel character
     skill_selections = {}  # Maps advancement descriptions to selected skills
 
-    # Helper function to extract skill names from Forgesteel Skill Choice features
-    def collect_skills_from_features(features_list):
-        selected_skills = []
-        if not features_list:
-            return selected_skills
-        for feature in features_list:
-            if feature.get("type") == "Skill Choice":
-                skills = feature.get("data", {}).get("selected", [])
-                if skills:
-                    # Normalize skill names to camelCase format used by Foundry
-                    selected_skills.extend([_normalize_skill_name(s) for s in skills])
-            elif feature.get("type") == "Multiple Features":
-                for sub_feature in feature.get("data", {}).get("features", []):
-                    if sub_feature.get("type") == "Skill Choice":
-                        skills = sub_feature.get("data", {}).get("selected", [])
-                        if skills:
-                            selected_skills.extend(
-                                [_normalize_skill_name(s) for s in skills]
-                            )
-        return selected_skills
-
     # Collect skills from all sources
     all_selected_skills = set()
 
@@ -1301,7 +1482,7 @@ def _populate_advancement_selections(character_data, source_data, compendium_ite
     ancestry = source_data.get("ancestry", {})
     if ancestry:
         all_selected_skills.update(
-            collect_skills_from_features(ancestry.get("features", []))
+            _iter_selected_skill_names(ancestry.get("features", []))
         )
 
     # From culture sections
@@ -1321,28 +1502,40 @@ def _populate_advancement_selections(character_data, source_data, compendium_ite
     career = source_data.get("career", {})
     if career:
         all_selected_skills.update(
-            collect_skills_from_features(career.get("features", []))
+            _iter_selected_skill_names(career.get("features", []))
         )
 
     # From class
     class_data = source_data.get("class", {})
     if class_data:
-        for level_data in class_data.get("featuresByLevel", []):
-            all_selected_skills.update(
-                collect_skills_from_features(level_data.get("features", []))
+        all_selected_skills.update(
+            chain.from_iterable(
+                _iter_selected_skill_names(level_data.get("features", []))
+                for level_data in class_data.get("featuresByLevel", [])
             )
+        )
 
     # From selected subclass
-    for subclass in class_data.get("subclasses", []):
-        if subclass.get("selected", False):
-            for level_data in subclass.get("featuresByLevel", []):
-                all_selected_skills.update(
-                    collect_skills_from_features(level_data.get("features", []))
-                )
+    all_selected_skills.update(
+        chain.from_iterable(
+            _iter_selected_skill_names(level_data.get("features", []))
+            for subclass in class_data.get("subclasses", [])
+            if subclass.get("selected", False)
+            for level_data in subclass.get("featuresByLevel", [])
+        )
+    )
+
+    # Resolve each selected skill's group once rather than per advancement
+    grouped_selected_skills = [
+        (skill, _SKILL_GROUPS_MAP[skill.lower()])
+        for skill in all_selected_skills
+        if skill.lower() in _SKILL_GROUPS_MAP
+    ]
 
     # Now go through character items and populate advancement selections
     for item in character_data.get("items", []):
-        if item.get("type") not in [
+        item_type = item.get("type")
+        if item_type not in [
             "ancestry",
             "culture",
             "career",
@@ -1354,13 +1547,14 @@ def _populate_advancement_selections(character_data, source_data, compendium_ite
         if "system" not in item or "advancements" not in item["system"]:
             continue
 
-        # Ensure item has flags structure for storing advancement selections
-        if "flags" not in item:
-            item["flags"] = {}
-        if "draw-steel" not in item["flags"]:
-            item["flags"]["draw-steel"] = {}
-        if "advancement" not in item["flags"]["draw-steel"]:
-            item["flags"]["draw-steel"]["advancement"] = {}
+        # Ensure item has flags structure for storing advancement selections.
+        # Each level is copied because items are shallow copies of compendium
+        # entries, and selections must not leak back into the compendium.
+        flags = item["flags"] = {**item.get("flags", {})}
+        draw_steel = flags["draw-steel"] = {**flags.get("draw-steel", {})}
+        advancement_flags = draw_steel["advancement"] = {
+            **draw_steel.get("advancement", {})
+        }
 
         # For each advancement in the item
         for advancement_id, advancement in item["system"]["advancements"].items():
@@ -1379,164 +1573,44 @@ def _populate_advancement_selections(character_data, source_data, compendium_ite
 
                 # If it has direct choices, select the ones that were selected in Forgesteel
                 if choices:
-                    selected_from_choices = []
-                    for choice in choices:
-                        if choice in all_selected_skills:
-                            selected_from_choices.append(choice)
+                    selected_from_choices = [
+                        choice for choice in choices if choice in all_selected_skills
+                    ]
 
                     if selected_from_choices:
                         selection_data = {"selected": selected_from_choices}
                         # Store at item level only (actor level should remain empty)
-                        item["flags"]["draw-steel"]["advancement"][advancement_id] = (
-                            selection_data
-                        )
+                        advancement_flags[advancement_id] = selection_data
 
                 # If it has groups, match selected skills against group members
                 if groups:
-                    selected_from_groups = []
-
-                    # Complete skill-to-group mapping from Draw Steel config
-                    skill_groups_map = {
-                        "alchemy": "crafting",
-                        "alertness": "intrigue",
-                        "architecture": "crafting",
-                        "blacksmithing": "crafting",
-                        "brag": "interpersonal",
-                        "carpentry": "crafting",
-                        "climb": "exploration",
-                        "concealObject": "intrigue",
-                        "cooking": "crafting",
-                        "criminalUnderworld": "lore",
-                        "culture": "lore",
-                        "disguise": "intrigue",
-                        "drive": "exploration",
-                        "eavesdrop": "intrigue",
-                        "empathize": "interpersonal",
-                        "endurance": "exploration",
-                        "escapeArtist": "intrigue",
-                        "fletching": "crafting",
-                        "flirt": "interpersonal",
-                        "forgery": "crafting",
-                        "gamble": "interpersonal",
-                        "gymnastics": "exploration",
-                        "handleAnimals": "interpersonal",
-                        "heal": "exploration",
-                        "hide": "intrigue",
-                        "history": "lore",
-                        "interrogate": "interpersonal",
-                        "intimidate": "interpersonal",
-                        "jewelry": "crafting",
-                        "jump": "exploration",
-                        "lead": "interpersonal",
-                        "lie": "interpersonal",
-                        "lift": "exploration",
-                        "magic": "lore",
-                        "mechanics": "crafting",
-                        "monsters": "lore",
-                        "music": "interpersonal",
-                        "nature": "lore",
-                        "navigate": "exploration",
-                        "perform": "interpersonal",
-                        "persuade": "interpersonal",
-                        "pickLock": "intrigue",
-                        "pickPocket": "intrigue",
-                        "psionics": "lore",
-                        "readPerson": "interpersonal",
-                        "religion": "lore",
-                        "ride": "exploration",
-                        "rumors": "lore",
-                        "sabotage": "intrigue",
-                        "search": "intrigue",
-                        "sneak": "intrigue",
-                        "society": "lore",
-                        "strategy": "lore",
-                        "swim": "exploration",
-                        "tailoring": "crafting",
-                        "timescape": "lore",
-                        "track": "intrigue",
-                    }
-
-                    for skill in all_selected_skills:
-                        skill_lower = skill.lower()
-                        if skill_lower in skill_groups_map:
-                            skill_group = skill_groups_map[skill_lower]
-                            # If this skill's group is in the advancement's allowed groups, include it
-                            if skill_group in groups:
-                                selected_from_groups.append(skill)
+                    # Keep the selected skills whose group the advancement allows
+                    selected_from_groups = [
+                        skill
+                        for skill, skill_group in grouped_selected_skills
+                        if skill_group in groups
+                    ]
 
                     if selected_from_groups:
                         selection_data = {"selected": selected_from_groups}
                         # Store at item level only (actor level should remain empty)
-                        item["flags"]["draw-steel"]["advancement"][advancement_id] = (
-                            selection_data
-                        )
+                        advancement_flags[advancement_id] = selection_data
 
             # Handle language advancements
             elif advancement_type == "language":
                 # For languages, collect from the appropriate source based on item type
                 selected_languages = set()
-                item_type = item.get("type")
-
-                # Helper to collect languages from features
-                def collect_languages_from_features(features_list):
-                    langs = []
-                    if not features_list:
-                        return langs
-                    for feature in features_list:
-                        if feature.get("type") == "Language Choice":
-                            feature_langs = feature.get("data", {}).get("selected", [])
-                            if feature_langs:
-                                langs.extend(
-                                    [_normalize_skill_name(l) for l in feature_langs]
-                                )
-                    return langs
 
                 # Only collect languages from the corresponding source for this item
-                if item_type == "culture":
-                    # Collect only from culture sections
-                    culture = source_data.get("culture", {})
-                    if culture:
-                        for section_name in [
-                            "language",
-                            "environment",
-                            "organization",
-                            "upbringing",
-                        ]:
-                            if section_name in culture:
-                                section = culture[section_name]
-                                if section.get("type") == "Language Choice":
-                                    langs = section.get("data", {}).get("selected", [])
-                                    if langs:
-                                        selected_languages.update(
-                                            [_normalize_skill_name(l) for l in langs]
-                                        )
-
-                elif item_type == "career":
-                    # Collect only from career
-                    career = source_data.get("career", {})
-                    if career:
-                        selected_languages.update(
-                            collect_languages_from_features(career.get("features", []))
-                        )
-
-                elif item_type == "class":
-                    # Collect only from class
-                    class_data = source_data.get("class", {})
-                    if class_data:
-                        for level_data in class_data.get("featuresByLevel", []):
-                            selected_languages.update(
-                                collect_languages_from_features(
-                                    level_data.get("features", [])
-                                )
-                            )
+                collect_languages = _LANGUAGE_SOURCES.get(item_type)
+                if collect_languages:
+                    selected_languages.update(collect_languages(source_data))
 
                 # Add selected languages to flags (only if this item's source had languages)
                 if selected_languages:
                     selection_data = {"selected": sorted(list(selected_languages))}
                     # Store at item level only (actor level should remain empty)
-                    item["flags"]["draw-steel"]["advancement"][advancement_id] = (
-                        selection_data
-                    )
+                    advancement_flags[advancement_id] = selection_data
 
 
 def _process_skills_from_advancements(character_data, source_data):
@@ -1544,19 +1618,7 @@ def _process_skills_from_advancements(character_data, source_data):
     collected_skills = []
 
     # Process top-level features for skills
-    for feature in source_data.get("features", []):
-        if feature.get("type") == "Skill Choice":
-            skills = feature.get("data", {}).get("selected", [])
-            if skills:
-                collected_skills.extend([_normalize_skill_name(s) for s in skills])
-        elif feature.get("type") == "Multiple Features":
-            for sub_feature in feature.get("data", {}).get("features", []):
-                if sub_feature.get("type") == "Skill Choice":
-                    skills = sub_feature.get("data", {}).get("selected", [])
-                    if skills:
-                        collected_skills.extend(
-                            [_normalize_skill_name(s) for s in skills]
-                        )
+    collected_skills.extend(_iter_selected_skill_names(source_data.get("features", [])))
 
     # Extract skills from culture sections (language, environment, organization, upbringing)
     culture = source_data.get("culture", {})
@@ -1574,123 +1636,45 @@ def _process_skills_from_advancements(character_data, source_data):
     # Extract skills from subclass features (only selected subclass)
     class_data = source_data.get("class", {})
     character_level = class_data.get("level", 1)
-    subclasses = class_data.get("subclasses", [])
-    for subclass in subclasses:
-        if not subclass.get("selected", False):
-            continue
-        for level_data in subclass.get("featuresByLevel", []):
-            level_num = level_data.get("level", 1)
-            if level_num <= character_level:
-                for feature in level_data.get("features", []):
-                    if feature.get("type") == "Skill Choice":
-                        skills = feature.get("data", {}).get("selected", [])
-                        if skills:
-                            collected_skills.extend(
-                                [_normalize_skill_name(s) for s in skills]
-                            )
-                    # Check for nested features (like Multiple Features)
-                    elif feature.get("type") == "Multiple Features":
-                        for sub_feature in feature.get("data", {}).get("features", []):
-                            if sub_feature.get("type") == "Skill Choice":
-                                skills = sub_feature.get("data", {}).get("selected", [])
-                                if skills:
-                                    collected_skills.extend(
-                                        [_normalize_skill_name(s) for s in skills]
-                                    )
+    subclass_levels = [
+        level_data
+        for subclass in class_data.get("subclasses", [])
+        if subclass.get("selected", False)
+        for level_data in subclass.get("featuresByLevel", [])
+        if level_data.get("level", 1) <= character_level
+    ]
+    for level_data in subclass_levels:
+        collected_skills.extend(
+            _iter_selected_skill_names(level_data.get("features", []))
+        )
 
     # Extract skills from source character data (ancestry, culture, career, class)
     for data_type in ["ancestry", "culture", "career", "class"]:
         if data_type in source_data:
             data_section = source_data[data_type]
 
-            # For class, check featuresByLevel as well
+            # For class, check featuresByLevel as well, including selected Domains
             if data_type == "class":
                 for level_data in data_section.get("featuresByLevel", []):
-                    for feature in level_data.get("features", []):
-                        if feature.get("type") == "Skill Choice":
-                            skills = feature.get("data", {}).get("selected", [])
-                            if skills:
-                                collected_skills.extend(
-                                    [_normalize_skill_name(s) for s in skills]
-                                )
-                        # Check for nested features (like Multiple Features)
-                        elif feature.get("type") == "Multiple Features":
-                            for sub_feature in feature.get("data", {}).get(
-                                "features", []
-                            ):
-                                if sub_feature.get("type") == "Skill Choice":
-                                    skills = sub_feature.get("data", {}).get(
-                                        "selected", []
-                                    )
-                                    if skills:
-                                        collected_skills.extend(
-                                            [_normalize_skill_name(s) for s in skills]
-                                        )
-                        # Check for Domain features with selected items that have their own featuresByLevel
-                        elif feature.get("type") == "Domain":
-                            for selected_domain in feature.get("data", {}).get(
-                                "selected", []
-                            ):
-                                for domain_level_data in selected_domain.get(
-                                    "featuresByLevel", []
-                                ):
-                                    for domain_feature in domain_level_data.get(
-                                        "features", []
-                                    ):
-                                        # Handle Multiple Features inside Domain
-                                        if (
-                                            domain_feature.get("type")
-                                            == "Multiple Features"
-                                        ):
-                                            for sub_feature in domain_feature.get(
-                                                "data", {}
-                                            ).get("features", []):
-                                                if (
-                                                    sub_feature.get("type")
-                                                    == "Skill Choice"
-                                                ):
-                                                    skills = sub_feature.get(
-                                                        "data", {}
-                                                    ).get("selected", [])
-                                                    if skills:
-                                                        collected_skills.extend(
-                                                            [
-                                                                _normalize_skill_name(s)
-                                                                for s in skills
-                                                            ]
-                                                        )
+                    collected_skills.extend(
+                        _iter_selected_skill_names(
+                            level_data.get("features", []), include_domains=True
+                        )
+                    )
             else:
                 # Check for skill features (including nested ones)
-                for feature in data_section.get("features", []):
-                    if feature.get("type") == "Skill Choice":
-                        skills = feature.get("data", {}).get("selected", [])
-                        if skills:
-                            collected_skills.extend(
-                                [_normalize_skill_name(s) for s in skills]
-                            )
-                    # Check for nested features (like Multiple Features)
-                    elif feature.get("type") == "Multiple Features":
-                        for sub_feature in feature.get("data", {}).get("features", []):
-                            if sub_feature.get("type") == "Skill Choice":
-                                skills = sub_feature.get("data", {}).get("selected", [])
-                                if skills:
-                                    collected_skills.extend(
-                                        [_normalize_skill_name(s) for s in skills]
-                                    )
-                    # Check skill choices in characteristics
-                if "characteristics" in data_section:
-                    for char_feature in data_section["characteristics"]:
-                        if "skills" in char_feature:
-                            collected_skills.extend(
-                                [
-                                    _normalize_skill_name(s)
-                                    for s in char_feature.get("skills", [])
-                                ]
-                            )
+                collected_skills.extend(
+                    _iter_selected_skill_names(data_section.get("features", []))
+                )
+                # Check skill choices in characteristics
+                for char_feature in data_section.get("characteristics", ()):
+                    collected_skills.extend(
+                        map(_normalize_skill_name, char_feature.get("skills", ()))
+                    )
                 # Check for direct skills array
                 if "skills" in data_section:
                     collected_skills.extend(
-                        [_normalize_skill_name(s) for s in data_section["skills"]]
+                        map(_normalize_skill_name, data_section["skills"])
                     )
 
     # Also check converted items for advancements (for compendium items)
@@ -1708,7 +1692,7 @@ def _process_skills_from_advancements(character_data, source_data):
     if collected_skills:
         existing_skills = character_data["system"]["hero"].get("skills", [])
         # Combine and deduplicate
-        all_skills = list(dict.fromkeys(existing_skills + collected_skills))
+        all_skills = list(dict.fromkeys(chain(existing_skills, collected_skills)))
         character_data["system"]["hero"]["skills"] = all_skills
     else:
         character_data["system"]["hero"]["skills"] = []
@@ -1749,11 +1733,12 @@ def _post_process_languages_and_culture(character_data, source_data):
 
     # Remove generic language items from the Foundry character's items list to avoid redundancy
     # This specifically targets "Language" features that are now handled in biography.
-    items_to_keep = []
-    for item in character_data.get("items", []):
-        if not (item.get("type") == "feature" and "Language" in item.get("name", "")):
-            items_to_keep.append(item)
-    character_data["items"] = items_to_keep
+    items = character_data.setdefault("items", [])
+    items[:] = [
+        item
+        for item in items
+        if not (item.get("type") == "feature" and "Language" in item.get("name", ""))
+    ]
 
 
 def _fix_ability_types(character_data):
@@ -1762,22 +1747,146 @@ def _fix_ability_types(character_data):
     # based on their source type, not hardcoded name patterns
 
     for item in character_data.get("items", []):
-        item_name = item.get("name", "")
-        item_system = item.get("system", {})
+        if item.get("type") != "feature":
+            continue
 
         # Fix based on system type - triggered actions should be abilities
-        if item.get("type") == "feature" and item_system.get("type") == "triggered":
+        item_system = item.get("system")
+        if item_system and item_system.get("type") == "triggered":
             item["type"] = "ability"
 
 
-if __name__ == "__main__":
-    print("WARNING: DO NOT RUN mapper.py DIRECTLY!")
-    print("This is an internal module. Use the main conversion script instead:")
-    print("   python forgesteel_converter.py input.ds-hero output.json")
-    print("See forgesteel_converter.py for proper usage instructions.")
-    print(
-        "If you need to debug mapper functionality, modify forgesteel_converter.py instead."
+# Compendium index used by batch workers. Forked workers inherit it
+# from the parent; spawned workers load it in _init_batch_worker.
+_BATCH_INDEX = None
+
+
+def _init_batch_worker(shm_name, size):
+    """Load the pickled compendium index from shared memory in a spawned worker."""
+    global _BATCH_INDEX
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _BATCH_INDEX = pickle.loads(shm.buf[:size])
+    finally:
+        shm.close()
+
+
+def _convert_batch_file(path, strict, verbose):
+    """Load and convert one character file inside a batch_convert worker."""
+    character_data = load_forgesteel_character(path)
+    return convert_character(character_data, _BATCH_INDEX, strict, verbose)
+
+
+def _convert_batch_character(character_data, strict, verbose):
+    """Convert one loaded character inside a convert_characters worker."""
+    return convert_character(character_data, _BATCH_INDEX, strict, verbose)
+
+
+def _run_batch(worker, inputs, compendium_items, strict, verbose, max_workers):
+    """Map a batch worker over inputs with the compendium index shared.
+
+    The compendium is indexed once in the parent. If fork is already the start
+    method (the Linux default), workers inherit the index copy-on-write. Fork
+    is not forced elsewhere, e.g. macOS defaults to spawn because fork is
+    unsafe there; in that case the index is pickled once into a shared memory
+    block that each worker unpickles, so the compendium JSON is never re-parsed
+    per worker.
+    """
+    global _BATCH_INDEX
+    if not inputs:
+        return []
+
+    index = CompendiumIndex.build(compendium_items)
+    count = len(inputs)
+
+    if multiprocessing.get_start_method() == "fork":
+        _BATCH_INDEX = index
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                return list(
+                    executor.map(worker, inputs, [strict] * count, [verbose] * count)
+                )
+        finally:
+            _BATCH_INDEX = None
+
+    payload = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+    shm = shared_memory.SharedMemory(create=True, size=len(payload))
+    try:
+        shm.buf[: len(payload)] = payload
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(shm.name, len(payload)),
+        ) as executor:
+            return list(
+                executor.map(worker, inputs, [strict] * count, [verbose] * count)
+            )
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def batch_convert(
+    paths, compendium_items, strict=False, verbose=False, max_workers=None
+):
+    """Convert several forgesteel character files in parallel processes.
+
+    Each worker loads its own file, so only paths cross the process boundary.
+
+    Args:
+        paths: Paths of forgesteel .ds-hero files
+        compendium_items: Loaded compendium items (dict)
+        strict: Passed through to convert_character
+        verbose: Passed through to convert_character
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        List of converted Foundry VTT characters, in the order of paths
+    """
+    return _run_batch(
+        _convert_batch_file,
+        [str(path) for path in paths],
+        compendium_items,
+        strict,
+        verbose,
+        max_workers,
     )
-    import sys
 
-    sys.exit(1)
+
+def convert_characters(
+    characters, compendium_items, strict=False, verbose=False, max_workers=None
+):
+    """Convert several already loaded forgesteel characters in parallel processes.
+
+    Args:
+        characters: Forgesteel character dicts
+        compendium_items: Loaded compendium items (dict)
+        strict: Passed through to convert_character
+        verbose: Passed through to convert_character
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        List of converted Foundry VTT characters, in the order given
+    """
+    return _run_batch(
+        _convert_batch_character,
+        list(characters),
+        compendium_items,
+        strict,
+        verbose,
+        max_workers,
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(
+        "WARNING: DO NOT RUN mapper.py DIRECTLY!\n"
+        "This is an internal module. Use the main conversion script instead:\n"
+        "   python forgesteel_converter.py input.ds-hero output.json\n"
+        "See forgesteel_converter.py for proper usage instructions.\n"
+        "If you need to debug mapper functionality, modify forgesteel_converter.py"
+        " instead."
+    )
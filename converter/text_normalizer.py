@@ -8,11 +8,30 @@ and other text normalization tasks at the ingestion boundary.
 import re
 import json
 import logging
-from typing import Dict, Optional, Set
+from functools import lru_cache
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
 
+# Control characters normalize_text removes, for debug logging
+_CONTROL_CHARS = frozenset(map(chr, range(32))) - {"\n", "\t"}
+
+
+class _PrintableTable(dict):
+    """str.translate table that drops non-printable characters.
+
+    Characters without an explicit entry are kept if printable (or a newline
+    or tab) and deleted otherwise; the decision is cached per code point.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        result = code if char.isprintable() or char in "\n\t" else None
+        self[code] = result
+        return result
+
+
 class TextNormalizer:
     """Centralized text normalization for encoding-aware processing."""
 
@@ -31,8 +50,8 @@ class TextNormalizer:
         "\u0410": "",  # Cyrillic capital A (problematic, remove entirely)
     }
 
-    # Characters to preserve (typography that should remain)
-    PRESERVE_CHARS: Set[str] = {"!", "?", ".", ",", ";", ":", "(", ")", "[", "]"}
+    # CHARACTER_MAP compiled for str.translate, also dropping non-printables
+    _CHARACTER_TABLE = _PrintableTable(str.maketrans(CHARACTER_MAP))
 
     @classmethod
     def normalize_text(cls, text: str) -> str:
@@ -47,32 +66,27 @@ class TextNormalizer:
         if not text:
             return text
 
+        # Fast path: printable ASCII with no surrounding spaces needs no work
+        if text.isascii() and text.isprintable() and text[0] != " " != text[-1]:
+            return text
+
         original_text = text  # Keep for logging
 
-        # Early UTF-8 normalization
-        try:
-            text = text.encode("utf-8", errors="ignore").decode("utf-8")
-        except UnicodeError as e:
-            logger.warning(f"UTF-8 normalization failed: {e}")
-            # Fall back to ascii-safe encoding
-            text = text.encode("ascii", errors="ignore").decode("ascii")
-
-        # Apply character replacements
-        for bad, good in cls.CHARACTER_MAP.items():
-            if bad in text:
-                text = text.replace(bad, good)
-                logger.debug(f"Replaced '{bad}' (U+{ord(bad):04X}) with '{good}'")
-
-        # Remove non-printable characters except newlines/tabs and preserved punctuation
-        allowed_chars = set("\n\t ") | cls.PRESERVE_CHARS
-        cleaned_chars = []
-        for char in text:
-            if char.isprintable() or char in allowed_chars:
-                cleaned_chars.append(char)
-            elif ord(char) < 32 and char not in ["\n", "\t"]:
-                logger.debug(f"Removed control character U+{ord(char):04X}")
-
-        text = "".join(cleaned_chars).strip()
+        if logger.isEnabledFor(logging.DEBUG):
+            for bad, good in cls.CHARACTER_MAP.items():
+                if bad in text:
+                    logger.debug(f"Replaced '{bad}' (U+{ord(bad):04X}) with '{good}'")
+            removed = sorted({ord(char) for char in text if char in _CONTROL_CHARS})
+            if removed:
+                logger.debug(
+                    "Removed control characters "
+                    + ", ".join(f"U+{code:04X}" for code in removed)
+                )
+
+        # Apply character replacements and remove non-printable characters
+        # (except newlines/tabs) in a single pass. Lone surrogates, the only
+        # thing a UTF-8 round-trip could strip, are non-printable as well.
+        text = text.translate(cls._CHARACTER_TABLE).strip()
 
         # Log significant changes
         if text != original_text:
@@ -92,6 +106,11 @@ class TextNormalizer:
         Returns:
             True if text survives JSON round-trip, False otherwise
         """
+        # ASCII strings always survive: json escapes quotes, backslashes and
+        # control characters and decodes them back exactly
+        if isinstance(text, str) and text.isascii():
+            return True
+
         try:
             serialized = json.dumps(text, ensure_ascii=False)
             deserialized = json.loads(serialized)
@@ -117,13 +136,28 @@ class TextNormalizer:
         "vigour": "vigor",
     }
 
+    # All SPELLING_VARIANTS in one alternation, so a name is scanned once
+    _SPELLING_RE = re.compile(
+        "|".join(map(re.escape, SPELLING_VARIANTS)), re.IGNORECASE | re.ASCII
+    )
+
+    # Punctuation removed for lookup; str.translate deletes characters mapped to None
+    _LOOKUP_PUNCTUATION_TABLE = dict.fromkeys(map(ord, ",.!?;:\"'()[]"))
+
+    @classmethod
+    def _american_spelling(cls, match: "re.Match[str]") -> str:
+        """Map a matched British spelling to its American equivalent."""
+        return cls.SPELLING_VARIANTS[match.group(0).lower()]
+
     @classmethod
+    @lru_cache(maxsize=4096)
     def sanitize_for_compendium_lookup(cls, name: str) -> str:
         """Sanitize text specifically for compendium name matching.
 
         This removes common punctuation that might interfere with name matching
         while preserving the essential text content. Also normalizes British
-        spellings to American spellings for consistent matching.
+        spellings to American spellings for consistent matching. Results are
+        memoized since the same compendium names are sanitized repeatedly.
 
         Args:
             name: Original name that may contain problematic characters
@@ -137,20 +171,13 @@ class TextNormalizer:
         # First normalize the text
         normalized = cls.normalize_text(name)
 
-        # Normalize British spellings to American spellings
-        lower_normalized = normalized.lower()
-        for british, american in cls.SPELLING_VARIANTS.items():
-            if british in lower_normalized:
-                # Preserve original case by replacing case-insensitively
-                normalized = re.sub(
-                    re.escape(british), american, normalized, flags=re.IGNORECASE
-                )
+        # Normalize British spellings to American spellings, matching
+        # case-insensitively anywhere in the name
+        normalized = cls._SPELLING_RE.sub(cls._american_spelling, normalized)
 
         # Remove punctuation that interferes with matching but preserve spaces
         # This is more aggressive than the basic normalize_text
-        punctuation_to_remove = ",.!?;:\"'()[]"
-        for char in punctuation_to_remove:
-            normalized = normalized.replace(char, "")
+        normalized = normalized.translate(cls._LOOKUP_PUNCTUATION_TABLE)
 
         # Normalize whitespace
         normalized = re.sub(r"\s+", " ", normalized).strip()
@@ -173,12 +200,13 @@ class TextNormalizer:
         Returns:
             Dictionary with change summary details
         """
+        kept_chars = set(normalized)
         return {
             "original_length": len(original),
             "normalized_length": len(normalized),
             "length_difference": len(normalized) - len(original),
-            "characters_removed": set(original) - set(normalized),
-            "has_unicode_issues": any(ord(c) > 127 for c in original),
+            "characters_removed": {c for c in original if c not in kept_chars},
+            "has_unicode_issues": not original.isascii(),
             "json_safe": cls.validate_json_roundtrip(normalized),
         }
 
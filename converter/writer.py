@@ -3,6 +3,11 @@ import random
 import string
 import time
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder is used otherwise
+    orjson = None
+
 def _generate_foundry_id():
     """Generate a valid 16-character alphanumeric ID for Foundry VTT."""
     chars = string.ascii_lowercase + string.digits
@@ -60,5 +65,16 @@ def write_foundry_character(character_data, file_path):
         })
 
     # Write with proper formatting
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(character_data, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+    with open(file_path, 'wb') as f:
+        f.write(_dumps_indented(character_data))
+
+def _dumps_indented(data):
+    """Encode data as 2-space indented UTF-8 JSON, via orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles those
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
@@ -10,10 +10,11 @@ Example:
 
 import argparse
 import json
+import os
 import sys
 import logging
 from pathlib import Path
-from converter.loader import load_forgesteel_character, load_compendium_items
+from converter.loader import load_compendium_items, parse_forgesteel_character
 from converter.mapper import convert_character
 from converter.writer import write_foundry_character
 
@@ -21,6 +22,17 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def _positive_int(value):
+    """argparse type for options that need a count of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert forgesteel character files to Foundry VTT format.",
@@ -51,46 +63,75 @@ def main():
         action="store_true",
         help="Force update compendium to latest version from GitHub",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse a local compendium instead of reusing the cached merge",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Processes used to parse a large local compendium (default: 1, serial)",
+    )
     args = parser.parse_args()
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    # Validate input file
+    # Read the input once up front and parse the bytes directly
     input_path = Path(args.input)
-    if not input_path.exists():
-        logger.error(f"Input file not found: {args.input}")
+    try:
+        input_data = input_path.read_bytes()
+    except FileNotFoundError:
+        logger.error("Input file not found: %s", args.input)
+        return 1
+    except OSError as e:
+        logger.error("Error: %s", e)
         return 1
 
     compendium_path = Path(args.compendium)
 
-    logger.debug(f"Input: {input_path.resolve()}")
-    logger.debug(f"Output: {Path(args.output).resolve()}")
-    logger.debug(f"Compendium (preferred): {compendium_path.resolve()}")
+    # resolve() costs a syscall per path, so only do it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Input: %s", input_path.resolve())
+        logger.debug("Output: %s", Path(args.output).resolve())
+        logger.debug("Compendium (preferred): %s", compendium_path.resolve())
 
     try:
-        logger.info(f"Loading character from {args.input}...")
-        forgesteel_char = load_forgesteel_character(args.input)
+        logger.info("Loading character from %s...", args.input)
+        forgesteel_char = parse_forgesteel_character(input_data)
         char_name = forgesteel_char.get("name", "Unknown")
-        logger.debug(f"Loaded character: {char_name}")
+        logger.debug("Loaded character: %s", char_name)
 
         logger.info("Loading compendium items...")
-        target_types = [
-            "ability",
-            "ancestry",
-            "career",
-            "culture",
-            "class",
-            "perk",
-            "project",
-        ]
+        target_types = frozenset(
+            {
+                "ability",
+                "ancestry",
+                "ancestryTrait",
+                "career",
+                "culture",
+                "class",
+                "subclass",
+                "feature",
+                "kit",
+                "complication",
+                "perk",
+                "project",
+                "title",
+                "treasure",
+            }
+        )
         compendium_items = load_compendium_items(
             str(compendium_path),
             verbose=args.verbose,
             force_update=args.update_compendium,
             target_types=target_types,
+            use_cache=not args.no_cache,
+            workers=args.workers,
         )
-        logger.debug(f"Loaded {len(compendium_items)} compendium items")
+        logger.debug("Loaded %d compendium items", len(compendium_items))
 
         logger.info("Converting character...")
         foundry_char = convert_character(
@@ -102,23 +143,26 @@ def main():
             return 1
 
         item_count = len(foundry_char.get("items", []))
-        logger.debug(f"Converted to {item_count} Foundry items")
+        logger.debug("Converted to %d Foundry items", item_count)
 
-        logger.info(f"Saving converted character to {args.output}...")
+        logger.info("Saving converted character to %s...", args.output)
         write_foundry_character(foundry_char, args.output)
 
-        logger.info("Conversion complete!")
-        logger.info(f"Successfully converted '{char_name}' with {item_count} items")
+        logger.info(
+            "Conversion complete! Successfully converted '%s' with %d items",
+            char_name,
+            item_count,
+        )
         return 0
 
     except FileNotFoundError as e:
-        logger.error(f"File not found: {e}")
+        logger.error("File not found: %s", e)
         return 1
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in {args.input}: {e}")
+        logger.error("Invalid JSON in %s: %s", args.input, e)
         return 1
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         if args.verbose:
             logger.debug("", exc_info=True)
         return 1
@@ -126,4 +170,11 @@ def main():
 
 if __name__ == "__main__":
     exit_code = main()
-    sys.exit(exit_code if exit_code else 0)
+    if exit_code:
+        sys.exit(exit_code)
+    # The output is written; skip tearing down the compendium and character
+    # objects at interpreter shutdown, flushing what atexit would have flushed
+    logging.shutdown()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)
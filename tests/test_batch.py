@@ -0,0 +1,89 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from converter import mapper
+from converter.mapper import batch_convert, convert_character, convert_characters
+
+
+def _character(name):
+    return {
+        "name": name,
+        "class": {"name": "Fury", "level": 1, "featuresByLevel": [], "abilities": []},
+        "ancestry": {"name": "Human", "features": []},
+    }
+
+
+COMPENDIUM = {
+    "catch-breath": {
+        "name": "Catch Breath",
+        "type": "ability",
+        "system": {"_dsid": "catch-breath"},
+    }
+}
+
+
+class TestBatchConversion(unittest.TestCase):
+    def setUp(self):
+        self.characters = [_character(name) for name in ("Ash", "Birch", "Cedar")]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.expected = [
+                convert_character(json.loads(json.dumps(character)), COMPENDIUM)
+                for character in self.characters
+            ]
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.paths = []
+        for character in self.characters:
+            path = os.path.join(self.tmpdir.name, f"{character['name']}.ds-hero")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(character, f)
+            self.paths.append(path)
+
+    def _run(self, convert, inputs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return convert(inputs, COMPENDIUM, max_workers=2)
+
+    def test_batch_convert_matches_sequential(self):
+        """Tests that batch_convert returns the sequential results in input order."""
+        self.assertEqual(self._run(batch_convert, self.paths), self.expected)
+        self.assertIsNone(mapper._BATCH_INDEX)
+
+    def test_convert_characters_matches_sequential(self):
+        """Tests that convert_characters returns the sequential results in input order."""
+        self.assertEqual(self._run(convert_characters, self.characters), self.expected)
+
+    def test_empty_batch(self):
+        """Tests that an empty batch returns an empty list without starting workers."""
+        self.assertEqual(batch_convert([], COMPENDIUM), [])
+        self.assertEqual(convert_characters([], COMPENDIUM), [])
+
+    def test_shared_memory_path(self):
+        """Tests the shared memory path used where fork is not the start method."""
+        with mock.patch.object(
+            mapper.multiprocessing, "get_start_method", return_value="spawn"
+        ):
+            self.assertEqual(self._run(batch_convert, self.paths), self.expected)
+            self.assertEqual(
+                self._run(convert_characters, self.characters), self.expected
+            )
+
+    @unittest.skipUnless(
+        "spawn" in multiprocessing.get_all_start_methods(), "spawn not available"
+    )
+    def test_spawned_workers(self):
+        """Tests that spawned workers load the index from shared memory."""
+        previous = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method("spawn", force=True)
+        self.addCleanup(multiprocessing.set_start_method, previous, force=True)
+        self.assertEqual(self._run(batch_convert, self.paths), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from converter.description_transfer import DescriptionTransfer
+
+
+class TestPreserveFormatting(unittest.TestCase):
+    def assertUnchanged(self, text):
+        self.assertEqual(DescriptionTransfer._preserve_formatting(text), text)
+
+    def test_plain_text_unchanged(self):
+        """Tests that text without tags is returned as-is."""
+        self.assertUnchanged("Deal 5 damage.")
+        self.assertUnchanged("")
+
+    def test_list_tags_not_confused_with_underline(self):
+        """Tests that <ul> and <li> do not count as unclosed <u> tags."""
+        self.assertUnchanged("<ul><li>a</li></ul>")
+
+    def test_void_tags_need_no_closer(self):
+        """Tests that <br> and <img> are not treated as unclosed <b> or <i>."""
+        self.assertUnchanged("a<br>b")
+        self.assertUnchanged('<img src="x">')
+        self.assertUnchanged("<p>x<br/></p>")
+
+    def test_unclosed_tag_is_closed(self):
+        """Tests that an unclosed supported tag gets its closer appended."""
+        self.assertEqual(
+            DescriptionTransfer._preserve_formatting("<b>bold "), "<b>bold</b>"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from converter import loader
+from converter.loader import load_compendium_items
+
+
+def _item(dsid, name, item_type="ability"):
+    return {"name": name, "type": item_type, "system": {"_dsid": dsid}}
+
+
+class TestMergedCompendiumCache(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.packs = Path(tmpdir.name, "packs")
+        (self.packs / "abilities").mkdir(parents=True)
+        self.merged_dir = Path(tmpdir.name, "cache", "merged")
+
+        self._write("abilities/fire-bolt.json", _item("fire-bolt", "Fire Bolt"))
+        self._write("abilities/ice-lance.json", _item("ice-lance", "Ice Lance"))
+        self._write("abilities/human.json", _item("human", "Human", "ancestry"))
+
+        patcher = mock.patch.object(loader, "CACHE_ROOT", Path(tmpdir.name, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write(self, relative_path, item, mtime_ns=None):
+        path = self.packs / relative_path
+        path.write_text(json.dumps(item), encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def _load(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return load_compendium_items(str(self.packs), **kwargs)
+
+    def _parse_spy(self):
+        return mock.patch.object(
+            loader, "_parse_json_files", wraps=loader._parse_json_files
+        )
+
+    def test_cache_hit_skips_parsing(self):
+        """Tests that an unchanged compendium is served from the merged cache."""
+        items = self._load()
+        self.assertEqual(sorted(items), ["fire-bolt", "human", "ice-lance"])
+        self.assertEqual(len(list(self.merged_dir.iterdir())), 1)
+
+        with self._parse_spy() as parse:
+            self.assertEqual(self._load(), items)
+        parse.assert_not_called()
+
+    def test_edited_pack_file_invalidates_cache(self):
+        """Tests that a changed pack file is re-parsed and replaces the cache."""
+        self._load()
+        self._write(
+            "abilities/fire-bolt.json",
+            _item("fire-bolt", "Fire Bolt II"),
+            mtime_ns=2_000_000_000 * 10**9,
+        )
+
+        with self._parse_spy() as parse:
+            items = self._load()
+        parse.assert_called_once()
+        self.assertEqual(items["fire-bolt"]["name"], "Fire Bolt II")
+        # The rebuilt cache overwrites the previous one rather than adding a file
+        self.assertEqual(len(list(self.merged_dir.iterdir())), 1)
+
+    def test_no_cache_reparses(self):
+        """Tests that use_cache=False re-parses even when a cache exists."""
+        items = self._load()
+        with self._parse_spy() as parse:
+            self.assertEqual(self._load(use_cache=False), items)
+        parse.assert_called_once()
+
+    def test_target_types_use_separate_cache(self):
+        """Tests that filtered loads are cached apart from unfiltered ones."""
+        self._load()
+        items = self._load(target_types=["ability"])
+        self.assertEqual(sorted(items), ["fire-bolt", "ice-lance"])
+        self.assertEqual(len(list(self.merged_dir.iterdir())), 2)
+
+    def test_unreadable_cache_is_ignored(self):
+        """Tests that a corrupt cache file falls back to parsing the packs."""
+        items = self._load()
+        for cache_file in self.merged_dir.iterdir():
+            cache_file.write_bytes(b"not json")
+        self.assertEqual(self._load(), items)
+
+
+if __name__ == '__main__':
+    unittest.main()